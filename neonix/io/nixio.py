@@ -11,15 +11,35 @@ from __future__ import absolute_import, print_function
 
 import os
 import time
+import tempfile
+import weakref
+import pickle
+from multiprocessing import cpu_count
+try:
+    from multiprocessing import get_all_start_methods, get_context
+except ImportError:  # Python 2
+    get_context = None
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+from multiprocessing.pool import ThreadPool
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from collections import Iterable
-import itertools
+from collections import Counter, Iterable, OrderedDict
+from functools import partial
+from itertools import islice
 from six import string_types
 from hashlib import md5
+try:
+    from hashlib import blake2b
+except ImportError:  # Python < 3.6
+    blake2b = None
 import warnings
 
 import quantities as pq
 import numpy as np
+import h5py
 
 from neo.io.baseio import BaseIO
 from neo.core import (Block, Segment, ChannelIndex, AnalogSignal,
@@ -71,6 +91,112 @@ def calculate_timestamp(dt):
     return int(time.mktime(dt.timetuple()))
 
 
+def default_hash_factory():
+    """
+    Returns a new hash object for computing the hashes of Neo objects.
+    BLAKE2b is used where available, MD5 otherwise.
+
+    :return: hashlib hash object
+    """
+    if blake2b is None:
+        return md5()
+    return blake2b(digest_size=16)
+
+
+# Size (in bytes) of the pieces in which large arrays are hashed
+HASH_CHUNK_SIZE = 1 << 22
+
+
+def array_chunks(arr, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Splits an array into pieces of at most ``chunk_size`` bytes that together
+    contain the bytes of the array in C order. Pieces of contiguous arrays
+    are views into the array. Non-contiguous arrays are split along their
+    first axis and each piece is copied separately, so that the array is never
+    copied as a whole.
+
+    :param arr: numpy array
+    :param chunk_size: Maximum size of each piece in bytes
+    :return: Generator of contiguous uint8 numpy arrays
+    """
+    arr = np.asarray(arr)
+    if arr.flags["C_CONTIGUOUS"]:
+        flat = arr.reshape(-1)
+        step = max(chunk_size // max(arr.itemsize, 1), 1)
+        for idx in range(0, max(flat.size, 1), step):
+            yield flat[idx:idx+step].view(np.uint8)
+    else:
+        rowsize = max(arr[:1].nbytes, 1)
+        step = max(chunk_size // rowsize, 1)
+        for idx in range(0, len(arr), step):
+            piece = np.ascontiguousarray(arr[idx:idx+step])
+            yield piece.reshape(-1).view(np.uint8)
+
+
+# HDF5 storage settings for the DataArrays written by the NixIO, per kind of
+# data: "signal" (AnalogSignal and IrregularlySampledSignal data), "times"
+# (Epoch, Event, and SpikeTrain times), "durations" (Epoch durations), and
+# "waveforms" (SpikeTrain waveforms).
+# Each kind maps to the number of elements per chunk along the first (time)
+# axis ("chunks") and the h5py filter options ("compression",
+# "compression_opts", "shuffle", "fletcher32"). Kinds that are not listed use
+# the defaults of nixio. Chunks of multidimensional data are shrunk to at most
+# MAX_CHUNK_SIZE bytes (see NixIO._chunk_shape).
+STORAGE_PROFILES = {
+    "default": {},
+    "fast-read": {
+        "signal": {"chunks": 65536},
+        "times": {"chunks": 8192},
+        "durations": {"chunks": 8192},
+        "waveforms": {"chunks": 256},
+    },
+    "archive": {
+        "signal": {"chunks": 16384, "compression": "gzip",
+                   "compression_opts": 6, "shuffle": True,
+                   "fletcher32": True},
+        "times": {"chunks": 4096, "compression": "gzip",
+                  "compression_opts": 6, "shuffle": True,
+                  "fletcher32": True},
+        "durations": {"chunks": 4096, "compression": "gzip",
+                      "compression_opts": 6, "shuffle": True,
+                      "fletcher32": True},
+        "waveforms": {"chunks": 128, "compression": "gzip",
+                      "compression_opts": 6, "shuffle": True,
+                      "fletcher32": True},
+    },
+    "append-friendly": {
+        "signal": {"chunks": 4096},
+        "times": {"chunks": 1024},
+        "durations": {"chunks": 1024},
+        "waveforms": {"chunks": 64},
+    },
+}
+
+
+# Size (in bytes) of the blocks in which datasets are copied by NixIO.compact
+COPY_BUFFER_SIZE = 1 << 26
+
+# Maximum size (in bytes) of the HDF5 chunks of DataArrays written with a
+# storage profile; the default size of the HDF5 chunk cache
+MAX_CHUNK_SIZE = 1 << 20
+
+
+def h5dataset(nix_obj, name="data"):
+    """
+    Returns the h5py Dataset that holds the data of a NIX DataArray (or the
+    dataset with the given name of any other NIX object, e.g., the ticks of a
+    RangeDimension), or None if the object is not backed by h5py.
+
+    :param nix_obj: NIX DataArray or other NIX object
+    :param name: Name of the dataset
+    :return: h5py Dataset or None
+    """
+    h5group = getattr(nix_obj, "_h5group", None)
+    if h5group is None:
+        return None
+    return h5group.group[name]
+
+
 class NixIO(BaseIO):
     """
     Class for reading and writing NIX files.
@@ -100,11 +226,32 @@ class NixIO(BaseIO):
         "units": "sources"
     }
 
-    def __init__(self, filename, mode="ro"):
+    def __init__(self, filename, mode="ro", hash_factory=None,
+                 hash_workers=None, signal_layout="split",
+                 storage_profile="default", change_detection="hash"):
         """
         Initialise IO instance and NIX file.
 
         :param filename: Full path to the file
+        :param mode: File mode, 'ro' (ReadOnly), 'rw' (ReadWrite), or 'ow'
+            (Overwrite)
+        :param hash_factory: Callable returning a new hashlib-like object,
+            used for detecting modified objects when writing
+            (default: ``default_hash_factory``)
+        :param hash_workers: Number of threads used for hashing large arrays
+            (default: number of CPUs)
+        :param signal_layout: Storage layout for new signals: 'split' stores
+            each channel in its own DataArray, '2d' stores each signal in a
+            single (time x channel) DataArray. Both layouts can be read.
+        :param storage_profile: Name of one of the ``STORAGE_PROFILES`` or a
+            dictionary of HDF5 chunking and filter settings per kind of data
+            (see ``STORAGE_PROFILES``) used for new DataArrays
+        :param change_detection: How objects that were read or written before
+            are checked for modifications when writing: 'hash' (default)
+            always hashes objects, 'snapshot' compares a snapshot of their
+            attributes and of the identity and layout of their arrays and
+            hashes only the objects whose snapshot differs. With 'snapshot',
+            arrays changed in place must be marked with ``mark_modified``.
         """
         BaseIO.__init__(self, filename)
         self.filename = filename
@@ -118,42 +265,165 @@ class NixIO(BaseIO):
             raise ValueError("Invalid mode specified '{}'. "
                              "Valid modes: 'ro' (ReadOnly)', 'rw' (ReadWrite), "
                              "'ow' (Overwrite).".format(mode))
+        if signal_layout not in ("split", "2d"):
+            raise ValueError("Invalid signal layout specified '{}'. "
+                             "Valid layouts: 'split', '2d'.".format(
+                                 signal_layout))
+        if change_detection not in ("snapshot", "hash"):
+            raise ValueError("Invalid change detection specified '{}'. "
+                             "Valid options: 'snapshot', 'hash'.".format(
+                                 change_detection))
         self.nix_file = nixio.File.open(self.filename, filemode, backend="h5py")
+        self._mode = mode
+        self._change_detection = change_detection
+        self._signal_layout = signal_layout
+        self._storage_profile = self._get_storage_profile(storage_profile)
         self._object_map = dict()
-        self._lazy_loaded = list()
+        self._object_keys = dict()
+        self._path_map = dict()
+        self._signal_groups = dict()
+        self._source_referers = dict()
+        self._metadata_cache = dict()
+        self._lazy_loaded = OrderedDict()
         self._object_hashes = dict()
+        self._unhashed_paths = set()
+        self._object_states = dict()
+        self._partial_reads = dict()
+        self._block_partials = None
+        self._names_resolved = None
+        self._hash_factory = hash_factory or default_hash_factory
+        self._hash_workers = hash_workers or cpu_count()
         self._block_read_counter = 0
 
-    def read_all_blocks(self, cascade=True, lazy=False):
+    @staticmethod
+    def _get_storage_profile(storage_profile):
+        """
+        Returns the storage settings for the given profile.
+
+        :param storage_profile: Name of one of the ``STORAGE_PROFILES`` or a
+            dictionary of settings per kind of data
+        :return: Dictionary of settings per kind of data
+        """
+        if isinstance(storage_profile, string_types):
+            try:
+                storage_profile = STORAGE_PROFILES[storage_profile]
+            except KeyError:
+                raise ValueError("Invalid storage profile specified '{}'. "
+                                 "Valid profiles: {}.".format(
+                                     storage_profile,
+                                     ", ".join(sorted(STORAGE_PROFILES))))
+        return storage_profile or dict()
+
+    def read_all_blocks(self, cascade=True, lazy=False, workers=None):
+        """
+        Reads all Blocks in the file.
+        If ``workers`` is greater than 1, Blocks are read in parallel by a pool
+        of worker processes, each of which opens the file read-only and sends
+        back the Blocks it read (see ``_share_result``). Workers are started
+        with the "forkserver" or "spawn" method, so that they do not inherit
+        the open HDF5 file; scripts using them need the usual
+        ``if __name__ == "__main__"`` guard.
+        Blocks are read serially if the file is not opened read-only (workers
+        could neither open the file alongside the IO nor see data it has not
+        flushed), if worker processes cannot be started this way (Python 2),
+        and for lazy reads and lazy cascades, which hold references to the
+        open file.
+
+        :param cascade: Read the objects contained in the Blocks
+        :param lazy: Do not load data if True
+        :param workers: Number of worker processes or None
+        :return: List of the loaded Blocks, in file order
+        """
+        blockpaths = list("/" + blk.name for blk in self.nix_file.blocks)
+        if (workers is None or workers < 2 or len(blockpaths) < 2 or
+                lazy or cascade == "lazy" or self._mode != "ro" or
+                get_context is None):
+            return list(self.read_block(path, cascade, lazy)
+                        for path in blockpaths)
+        tasks = list((self.filename, path, cascade) for path in blockpaths)
+        if "forkserver" in get_all_start_methods():
+            context = get_context("forkserver")
+        else:
+            context = get_context("spawn")
+        pool = context.Pool(min(workers, len(blockpaths)))
+        try:
+            results = pool.map(_read_block_worker, tasks)
+        finally:
+            pool.close()
+            pool.join()
+        unshared = list()
+        try:
+            while results:
+                unshared.append(_unshare_result(results.pop(0)))
+        finally:
+            for shared in results:
+                _discard_shared(shared)
         blocks = list()
-        for blk in self.nix_file.blocks:
-            blocks.append(self.read_block("/" + blk.name, cascade, lazy))
+        for neo_block, object_map, object_hashes, unhashed in unshared:
+            self._relink_block(neo_block)
+            for key, neoobj in object_map.items():
+                self._map_object(key, neoobj)
+            self._object_hashes.update(object_hashes)
+            self._unhashed_paths.update(p for p in unhashed
+                                        if p not in self._object_hashes)
+            for neoobj in object_map.values():
+                if getattr(neoobj, "path", None) in unhashed:
+                    self._record_state(neoobj.path, neoobj)
+            blocks.append(neo_block)
         return blocks
 
-    def read_block(self, path="/", cascade=True, lazy=False):
+    def read_block(self, path="/", cascade=True, lazy=False, channels=None):
+        """
+        Reads the Block at the location specified by the path.
+        If ``channels`` is given, only the selected channels of each signal
+        are read (see ``read_signal``). Signals that contain none of the
+        selected channels are skipped.
+
+        :param path: Location of the Block in the file
+        :param cascade: Read the objects contained in the Block
+        :param lazy: Do not load data if True
+        :param channels: Selection of signal channels or None
+        :return: The loaded Block
+        """
         if path == "/":
             try:
                 # Use yield?
                 nix_block = self.nix_file.blocks[self._block_read_counter]
                 path += nix_block.name
+                self._path_map[path] = nix_block
                 self._block_read_counter += 1
             except KeyError:
                 return None
         else:
             nix_block = self._get_object_at(path)
+        if cascade:
+            self._prefetch_metadata(nix_block.metadata)
         neo_block = self._block_to_neo(nix_block)
         neo_block.path = path
         if cascade:
-            self._read_cascade(nix_block, path, cascade, lazy)
+            channels = self._get_channel_positions(nix_block, channels)
+            # partial signals read for this Block, for linking them to the
+            # Block's ChannelIndexes
+            block_partials = self._block_partials
+            self._block_partials = dict()
+            try:
+                self._read_cascade(nix_block, path, cascade, lazy, channels)
+            finally:
+                self._block_partials = block_partials
         self._update_maps(neo_block, lazy)
         return neo_block
 
-    def read_segment(self, path, cascade=True, lazy=False):
+    def read_segment(self, path, cascade=True, lazy=False, channels=None):
         nix_group = self._get_object_at(path)
+        if cascade:
+            self._prefetch_metadata(nix_group.metadata)
         neo_segment = self._group_to_neo(nix_group)
         neo_segment.path = path
         if cascade:
-            self._read_cascade(nix_group, path, cascade, lazy)
+            if channels is not None:
+                nix_block = self._get_object_at("/" + path.split("/")[1])
+                channels = self._get_channel_positions(nix_block, channels)
+            self._read_cascade(nix_group, path, cascade, lazy, channels)
         self._update_maps(neo_segment, lazy)
         nix_parent = self._get_parent(path)
         neo_parent = self._get_mapped_object(nix_parent)
@@ -161,8 +431,75 @@ class NixIO(BaseIO):
             neo_segment.block = neo_parent
         return neo_segment
 
+    def iter_segments(self, path, lazy=False, channels=None):
+        """
+        Iterates over the Segments of the Block at the location specified by
+        the path, yielding one Segment at a time with all its signals, epochs,
+        events, and spiketrains loaded.
+        Once the iteration moves to the next Segment, the previous one and its
+        children are removed from the IO's object map and lazy-object registry,
+        so that they can be garbage collected when the caller releases them.
+
+        :param path: Location of the Block in the file
+        :param lazy: Do not load data if True
+        :param channels: Selection of signal channels or None
+        :return: Generator of Neo Segments
+        """
+        nix_block = self._get_object_at(path)
+        for nix_group in nix_block.groups:
+            if nix_group.type != "neo.segment":
+                continue
+            segpath = path + "/segments/" + nix_group.name
+            neo_segment = self.read_segment(segpath, True, lazy, channels)
+            try:
+                yield neo_segment
+            finally:
+                self._release_segment(neo_segment)
+
+    def _release_segment(self, neo_segment):
+        """
+        Removes a Segment and its children from the object map and lazy-object
+        registry and drops the cached paths, hashes, snapshots, signal groups,
+        and metadata of the Segment and its children.
+        The Source reverse index of the Block (see ``_get_source_referers``)
+        references the Segment's DataArrays and MultiTags and cannot be
+        pruned without becoming incomplete, so it is dropped and rebuilt the
+        next time it is needed.
+
+        :param neo_segment: A Neo Segment read by the IO
+        """
+        children = (neo_segment.analogsignals +
+                    neo_segment.irregularlysampledsignals +
+                    neo_segment.epochs + neo_segment.events +
+                    neo_segment.spiketrains)
+        self._forget_objects([neo_segment] + children)
+        path = neo_segment.path
+        prefix = path + "/"
+        nix_group = self._get_object_at(path)
+        nix_block = self._get_object_at("/" + path.split("/")[1])
+        self._signal_groups.pop(nix_group.id, None)
+        self._source_referers.pop(nix_block.id, None)
+        sections = list()
+        if nix_group.metadata is not None:
+            sections.append(nix_group.metadata)
+        while sections:
+            sec = sections.pop()
+            self._metadata_cache.pop(sec.id, None)
+            sections.extend(sec.sections)
+        for cache in (self._path_map, self._object_hashes,
+                      self._object_states):
+            for key in [k for k in cache
+                        if k == path or k.startswith(prefix)]:
+                del cache[key]
+        self._unhashed_paths.difference_update(
+            [k for k in self._unhashed_paths
+             if k == path or k.startswith(prefix)]
+        )
+
     def read_channelindex(self, path, cascade=True, lazy=False):
         nix_source = self._get_object_at(path)
+        if cascade:
+            self._prefetch_metadata(nix_source.metadata)
         neo_rcg = self._source_chx_to_neo(nix_source)
         neo_rcg.path = path
         if cascade:
@@ -173,17 +510,179 @@ class NixIO(BaseIO):
         neo_rcg.block = neo_parent
         return neo_rcg
 
-    def read_signal(self, path, lazy=False):
-        nix_data_arrays = list()
+    def read_signal(self, path, lazy=False, t_start=None, t_stop=None,
+                    channels=None):
+        """
+        Reads the AnalogSignal or IrregularlySampledSignal at the location
+        specified by the path. If ``t_start`` or ``t_stop`` are given, only the
+        samples that fall within the time window are read from the file.
+
+        If ``channels`` is given, only the DataArrays of the selected channels
+        are read. Channels can be selected by their position in the signal, by
+        the channel names stored with the ChannelIndex objects of the Block,
+        or by passing a Neo ChannelIndex, in which case its ``index`` is used.
+
+        :param path: Location of the signal in the file
+        :param lazy: Do not load data if True
+        :param t_start: Start of the time window (Quantity) or None
+        :param t_stop: End of the time window (Quantity) or None
+        :param channels: Channel positions, channel names, or ChannelIndex
+        :return: The loaded signal
+        """
+        nix_data_arrays, columns = self._get_signal_data_arrays(path,
+                                                                channels)
+        timedim = self._get_time_dimension(nix_data_arrays[0])
+        nsamples = len(nix_data_arrays[0])
+        start, stop = self._get_sample_window(timedim, nsamples,
+                                              t_start, t_stop)
+        neo_signal = self._signal_da_to_neo(nix_data_arrays, lazy,
+                                            sample_range=(start, stop),
+                                            columns=columns)
+        neo_signal.path = path
+        parent_das = self._get_signal_groups(self._get_parent(path))[
+            path.split("/")[-1]
+        ]
+        if columns is None:
+            whole = (list(da.id for da in nix_data_arrays) ==
+                     list(da.id for da in parent_das))
+        else:
+            whole = columns == list(range(parent_das[0].shape[1]))
+        is_partial = start > 0 or stop < nsamples or not whole
+        if is_partial:
+            self._record_partial(neo_signal, path, start, stop,
+                                 nix_data_arrays, columns)
+        else:
+            for da in nix_data_arrays:
+                self._map_object(da.id, neo_signal)
+        if self._find_lazy_loaded(neo_signal) is None:
+            if not is_partial:
+                self._update_maps(neo_signal, lazy)
+            nix_parent = self._get_parent(path)
+            neo_parent = self._get_mapped_object(nix_parent)
+            neo_signal.segment = neo_parent
+        return neo_signal
+
+    def _record_partial(self, neo_signal, path, start, stop, nix_data_arrays,
+                        columns):
+        """
+        Records the part of the stored signal that a signal read from a
+        channel subset or time window holds. Partially read signals are not
+        registered as the object stored at their path, so that they are never
+        taken for the full signal when writing. Writing them back to their
+        path writes only the recorded part (see ``_write_partial``).
+        Records are dropped when the signal is garbage collected. Signals read
+        while a Block is read are also collected for the Block, so that only
+        they are linked to the Block's ChannelIndexes.
+
+        :param neo_signal: The partially read Neo signal
+        :param path: Location of the signal in the file
+        :param start: Index of the first sample read
+        :param stop: Index after the last sample read
+        :param nix_data_arrays: The DataArrays that were read
+        :param columns: The columns read from a 2-D DataArray or None
+        """
+        key = id(neo_signal)
+        partial_reads = self._partial_reads
+        partial_reads[key] = {
+            "ref": weakref.ref(neo_signal,
+                               lambda _: partial_reads.pop(key, None)),
+            "path": path,
+            "start": start,
+            "stop": stop,
+            "data_arrays": list(nix_data_arrays),
+            "columns": columns,
+            "hash": None,
+        }
+        if self._block_partials is not None:
+            for da in nix_data_arrays:
+                self._block_partials[da.id] = neo_signal
+
+    def _get_partial(self, obj):
+        """
+        Returns the record of a partially read signal (see
+        ``_record_partial``) or None if the object was not read partially.
+
+        :param obj: A Neo object
+        :return: Dictionary or None
+        """
+        record = self._partial_reads.get(id(obj))
+        if record is None or record["ref"]() is not obj:
+            return None
+        return record
+
+    def iter_signal_chunks(self, path, chunk_samples, overlap=0,
+                           channels=None):
+        """
+        Iterates over the AnalogSignal or IrregularlySampledSignal at the
+        location specified by the path in chunks of consecutive samples,
+        reading only one chunk from the file at a time.
+        Each chunk is yielded as a signal of the same type with its own
+        ``t_start`` (or ``times``). Requests of at least one HDF5 chunk of the
+        DataArrays are rounded down to a whole number of HDF5 chunks; smaller
+        requests are honoured as given. If ``overlap`` is given,
+        each chunk except the first also contains the last ``overlap`` samples
+        of the previous chunk.
+
+        :param path: Location of the signal in the file
+        :param chunk_samples: Number of samples per chunk
+        :param overlap: Number of samples shared between consecutive chunks
+        :param channels: Channel positions, channel names, or ChannelIndex
+        :return: Generator of Neo signals
+        """
+        if chunk_samples < 1:
+            raise ValueError("chunk_samples must be positive")
+        if overlap < 0:
+            raise ValueError("overlap must not be negative")
+        nix_data_arrays, columns = self._get_signal_data_arrays(path,
+                                                                channels)
+        dset = h5dataset(nix_data_arrays[0])
+        if dset is not None and dset.chunks:
+            h5chunk = dset.chunks[0]
+            if chunk_samples >= h5chunk:
+                chunk_samples -= chunk_samples % h5chunk
+        nsamples = len(nix_data_arrays[0])
+        for start in range(0, nsamples, chunk_samples):
+            stop = min(start + chunk_samples, nsamples)
+            neo_signal = self._signal_da_to_neo(
+                nix_data_arrays, False,
+                sample_range=(max(start - overlap, 0), stop), columns=columns
+            )
+            neo_signal.path = path
+            yield neo_signal
+
+    def _get_signal_data_arrays(self, path, channels=None):
+        """
+        Returns the DataArrays of the signal at the location specified by the
+        path, optionally restricted to a selection of channels (see
+        ``read_signal``).
+        For signals stored in the split layout, the DataArrays of the selected
+        channels are returned. For signals stored as a single 2-D DataArray,
+        the DataArray is returned along with the selected columns.
+
+        :param path: Location of the signal in the file
+        :param channels: Channel positions, channel names, or ChannelIndex
+        :return: Tuple (list of NIX DataArrays ordered by channel, list of
+            selected columns of a 2-D DataArray or None)
+        """
         parent_group = self._get_parent(path)
-        parent_container = parent_group.data_arrays
         signal_group_name = path.split("/")[-1]
-        for idx in itertools.count():
-            signal_name = "{}.{}".format(signal_group_name, idx)
-            if signal_name in parent_container:
-                nix_data_arrays.append(parent_container[signal_name])
+        nix_data_arrays = self._get_signal_groups(parent_group)[
+            signal_group_name
+        ]
+        columns = None
+        if channels is not None:
+            nix_block = self._get_object_at("/" + path.split("/")[1])
+            channels = self._get_channel_positions(nix_block, channels)
+            nchannels = self._signal_channel_count(nix_data_arrays)
+            selected = list(idx for idx in channels if idx < nchannels)
+            if not selected:
+                raise ValueError("None of the selected channels exist in "
+                                 "signal {}".format(path))
+            if self._is_matrix_signal(nix_data_arrays):
+                columns = selected
             else:
-                break
+                nix_data_arrays = list(nix_data_arrays[idx]
+                                       for idx in selected)
         # check metadata segment
         group_section = nix_data_arrays[0].metadata
         for da in nix_data_arrays:
@@ -191,20 +690,43 @@ class NixIO(BaseIO):
                 "DataArray {} is not a member of signal group {}".format(
                     da.name, group_section.name
                 )
-        neo_signal = self._signal_da_to_neo(nix_data_arrays, lazy)
-        neo_signal.path = path
-        if self._find_lazy_loaded(neo_signal) is None:
-            self._update_maps(neo_signal, lazy)
-            nix_parent = self._get_parent(path)
-            neo_parent = self._get_mapped_object(nix_parent)
-            neo_signal.segment = neo_parent
-        return neo_signal
+        return nix_data_arrays, columns
 
-    def read_analogsignal(self, path, cascade=True, lazy=False):
-        return self.read_signal(path, lazy)
+    @staticmethod
+    def _is_matrix_signal(nix_da_group):
+        """
+        Returns True if a signal is stored as a single 2-D (time x channel)
+        DataArray rather than one DataArray per channel.
+
+        :param nix_da_group: The list of DataArrays of a signal
+        :return: True or False
+        """
+        return len(nix_da_group) == 1 and len(nix_da_group[0].shape) == 2
+
+    @classmethod
+    def _signal_channel_count(cls, nix_da_group, columns=None):
+        """
+        Returns the number of channels of a signal, or of the selected columns
+        of a signal stored as a single 2-D DataArray.
 
-    def read_irregularlysampledsignal(self, path, cascade=True, lazy=False):
-        return self.read_signal(path, lazy)
+        :param nix_da_group: The list of DataArrays of a signal
+        :param columns: Selected columns of a 2-D DataArray or None
+        :return: Number of channels
+        """
+        if columns is not None:
+            return len(columns)
+        if cls._is_matrix_signal(nix_da_group):
+            return nix_da_group[0].shape[1]
+        return len(nix_da_group)
+
+    def read_analogsignal(self, path, cascade=True, lazy=False,
+                          t_start=None, t_stop=None, channels=None):
+        return self.read_signal(path, lazy, t_start, t_stop, channels)
+
+    def read_irregularlysampledsignal(self, path, cascade=True, lazy=False,
+                                      t_start=None, t_stop=None,
+                                      channels=None):
+        return self.read_signal(path, lazy, t_start, t_stop, channels)
 
     def read_eest(self, path, lazy=False):
         nix_mtag = self._get_object_at(path)
@@ -240,13 +762,13 @@ class NixIO(BaseIO):
     def _block_to_neo(self, nix_block):
         neo_attrs = self._nix_attr_to_neo(nix_block)
         neo_block = Block(**neo_attrs)
-        self._object_map[nix_block.id] = neo_block
+        self._map_object(nix_block.id, neo_block)
         return neo_block
 
     def _group_to_neo(self, nix_group):
         neo_attrs = self._nix_attr_to_neo(nix_group)
         neo_segment = Segment(**neo_attrs)
-        self._object_map[nix_group.id] = neo_segment
+        self._map_object(nix_group.id, neo_segment)
         return neo_segment
 
     def _source_chx_to_neo(self, nix_source):
@@ -262,70 +784,229 @@ class NixIO(BaseIO):
             coord_values = list(c["coordinates"] for c in chx)
             neo_attrs["coordinates"] = pq.Quantity(coord_values, coord_units)
         rcg = ChannelIndex(**neo_attrs)
-        self._object_map[nix_source.id] = rcg
+        self._map_object(nix_source.id, rcg)
         return rcg
 
     def _source_unit_to_neo(self, nix_unit):
         neo_attrs = self._nix_attr_to_neo(nix_unit)
         neo_unit = Unit(**neo_attrs)
-        self._object_map[nix_unit.id] = neo_unit
+        self._map_object(nix_unit.id, neo_unit)
         return neo_unit
 
-    def _signal_da_to_neo(self, nix_da_group, lazy):
+    def _signal_da_to_neo(self, nix_da_group, lazy, t_start=None, t_stop=None,
+                          sample_range=None, columns=None):
         """
         Convert a group of NIX DataArrays to a Neo signal. This method expects
         a list of data arrays that all represent the same, multidimensional
-        Neo Signal object.
+        Neo Signal object, ordered by channel index.
         This returns either an AnalogSignal or IrregularlySampledSignal.
 
+        If ``t_start`` or ``t_stop`` are specified, only the samples within
+        the time window are read (see ``_get_sample_window``). Alternatively,
+        ``sample_range`` selects the samples to read by index.
+
+        In lazy mode, the returned signal contains no data, but its ``proxy``
+        attribute holds a SignalProxy for reading any part of the data on
+        demand. The time attributes and units of lazy signals are read from
+        the file.
+
         :param nix_da_group: a list of NIX DataArray objects
+        :param lazy: Do not load data if True
+        :param t_start: Start of the time window (Quantity) or None
+        :param t_stop: End of the time window (Quantity) or None
+        :param sample_range: Tuple (start, stop) of sample indices or None
+        :param columns: Selected columns of a 2-D DataArray or None
         :return: a Neo Signal object
         """
-        nix_da_group = sorted(nix_da_group, key=lambda d: d.name)
         neo_attrs = self._nix_attr_to_neo(nix_da_group[0])
         neo_attrs["name"] = stringify(nix_da_group[0].metadata.name)
         neo_type = nix_da_group[0].type
 
         unit = nix_da_group[0].unit
+        timedim = self._get_time_dimension(nix_da_group[0])
+        if sample_range is None:
+            start, stop = self._get_sample_window(timedim,
+                                                  len(nix_da_group[0]),
+                                                  t_start, t_stop)
+        else:
+            start, stop = sample_range
         if lazy:
             signaldata = pq.Quantity(np.empty(0), unit)
-            lazy_shape = (len(nix_da_group[0]), len(nix_da_group))
+            lazy_shape = (stop - start,
+                          self._signal_channel_count(nix_da_group, columns))
         else:
-            signaldata = pq.Quantity(np.transpose(nix_da_group), unit)
+            signaldata = pq.Quantity(
+                self._read_signal_data(nix_da_group, start, stop, columns),
+                unit, copy=False
+            )
             lazy_shape = None
-        timedim = self._get_time_dimension(nix_da_group[0])
         if neo_type == "neo.analogsignal"\
                 or isinstance(timedim, nixtypes["SampledDimension"]):
-            if lazy:
-                sampling_period = pq.Quantity(1, timedim.unit)
-                t_start = pq.Quantity(0, timedim.unit)
-            else:
-                sampling_period = pq.Quantity(timedim.sampling_interval,
-                                              timedim.unit)
-                sampling_period = sampling_period.rescale("ms")
-                t_start = pq.Quantity(timedim.offset, timedim.unit)
+            sampling_period = pq.Quantity(timedim.sampling_interval,
+                                          timedim.unit)
+            t_start = pq.Quantity(
+                (timedim.offset or 0) + start * timedim.sampling_interval,
+                timedim.unit
+            )
+            sampling_period = sampling_period.rescale("ms")
             neo_signal = AnalogSignal(
                 signal=signaldata, sampling_period=sampling_period,
-                t_start=t_start, **neo_attrs
+                t_start=t_start, copy=False, **neo_attrs
             )
+            ticks = None
         elif neo_type == "neo.irregularlysampledsignal"\
                 or isinstance(timedim, nixtypes["RangeDimension"]):
+            ticks = h5dataset(timedim, "ticks")
+            if ticks is None:
+                ticks = timedim.ticks
             if lazy:
                 times = pq.Quantity(np.empty(0), timedim.unit)
             else:
-                times = pq.Quantity(timedim.ticks, timedim.unit)
+                times = pq.Quantity(ticks[start:stop], timedim.unit)
             neo_signal = IrregularlySampledSignal(
-                signal=signaldata, times=times, **neo_attrs
+                signal=signaldata, times=times, copy=False, **neo_attrs
             )
         else:
             return None
-        for da in nix_da_group:
-            self._object_map[da.id] = neo_signal
         if lazy_shape:
             neo_signal.lazy_shape = lazy_shape
+            neo_signal.proxy = SignalProxy(nix_da_group, unit, start, stop,
+                                           timedim, ticks, columns)
         return neo_signal
 
+    @staticmethod
+    def _read_signal_data(nix_da_group, start=0, stop=None, columns=None):
+        """
+        Reads the data of a group of NIX DataArrays that represent the
+        channels of a single Neo Signal. The (samples x channels) array is
+        allocated once and each channel is read from its HDF5 dataset directly
+        into its column, without any intermediate copies.
+        Signals stored as a single 2-D DataArray are read in one hyperslab
+        (see ``_read_matrix_data``).
+        Only the samples in the range [start, stop) are read.
+
+        :param nix_da_group: a list of NIX DataArray objects, ordered by channel
+        :param start: Index of the first sample to read
+        :param stop: Index after the last sample to read (None reads to the end)
+        :param columns: Selected columns of a 2-D DataArray or None
+        :return: a numpy array of shape (samples, channels)
+        """
+        if NixIO._is_matrix_signal(nix_da_group):
+            return NixIO._read_matrix_data(nix_da_group[0], start, stop,
+                                           columns)
+        if stop is None:
+            stop = len(nix_da_group[0])
+        nsamples = max(stop - start, 0)
+        dtype = np.result_type(*(da.dtype for da in nix_da_group))
+        data = np.empty((nsamples, len(nix_da_group)), dtype=dtype)
+        if not nsamples:
+            return data
+        for idx, da in enumerate(nix_da_group):
+            dset = h5dataset(da)
+            calibrated = len(da.polynom_coefficients) or da.expansion_origin
+            if dset is None or calibrated or dset.dtype != dtype:
+                data[:, idx] = da[start:stop]
+            else:
+                dset.read_direct(data, source_sel=np.s_[start:stop],
+                                 dest_sel=np.s_[:, idx])
+        return data
+
+    @staticmethod
+    def _read_matrix_data(nix_da, start=0, stop=None, columns=None):
+        """
+        Reads the data of a signal stored as a single 2-D (time x channel)
+        NIX DataArray. Only the samples in the range [start, stop) and the
+        selected columns are read.
+
+        :param nix_da: a 2-D NIX DataArray
+        :param start: Index of the first sample to read
+        :param stop: Index after the last sample to read (None reads to the end)
+        :param columns: List of columns to read or None for all columns
+        :return: a numpy array of shape (samples, channels)
+        """
+        if stop is None:
+            stop = len(nix_da)
+        nsamples = max(stop - start, 0)
+        ncolumns = nix_da.shape[1]
+        if columns is None:
+            columns = list(range(ncolumns))
+        if not nsamples:
+            return np.empty((0, len(columns)), dtype=nix_da.dtype)
+        dset = h5dataset(nix_da)
+        calibrated = (len(nix_da.polynom_coefficients) or
+                      nix_da.expansion_origin)
+        if dset is None or calibrated:
+            data = np.asarray(nix_da[start:stop])
+            return np.ascontiguousarray(data[:, columns])
+        if columns == list(range(ncolumns)):
+            data = np.empty((nsamples, ncolumns), dtype=dset.dtype)
+            dset.read_direct(data, source_sel=np.s_[start:stop])
+            return data
+        # h5py requires increasing indices for selections along an axis
+        unique = sorted(set(columns))
+        data = dset[start:stop, unique]
+        if unique != columns:
+            positions = dict((col, idx) for idx, col in enumerate(unique))
+            data = data[:, list(positions[col] for col in columns)]
+        return np.ascontiguousarray(data)
+
+    @staticmethod
+    def _get_sample_window(timedim, nsamples, t_start=None, t_stop=None):
+        """
+        Converts a time window into a range of sample indices of a signal,
+        using the offset and sampling interval of a SampledDimension or a
+        binary search over the ticks of a RangeDimension.
+        For sampled signals, times are rounded to the nearest sample, as in
+        ``AnalogSignal.time_slice``. For irregularly sampled signals, all
+        samples with t_start <= t <= t_stop are included, as in
+        ``IrregularlySampledSignal.time_slice``.
+
+        :param timedim: The time dimension of the signal
+        :param nsamples: The number of samples in the signal
+        :param t_start: Start of the time window (Quantity) or None
+        :param t_stop: End of the time window (Quantity) or None
+        :return: Tuple (start, stop) of sample indices
+        """
+        start, stop = 0, nsamples
+        if t_start is None and t_stop is None:
+            return start, stop
+        unit = timedim.unit
+        if isinstance(timedim, nixtypes["SampledDimension"]):
+            offset = timedim.offset or 0
+            interval = timedim.sampling_interval
+            if t_start is not None:
+                t_start = t_start.rescale(unit).magnitude.item()
+                start = int(np.rint((t_start - offset) / interval))
+            if t_stop is not None:
+                t_stop = t_stop.rescale(unit).magnitude.item()
+                stop = int(np.rint((t_stop - offset) / interval))
+        elif isinstance(timedim, nixtypes["RangeDimension"]):
+            ticks = h5dataset(timedim, "ticks")
+            if ticks is None:
+                ticks = timedim.ticks
+            if t_start is not None:
+                t_start = t_start.rescale(unit).magnitude.item()
+                start = bisect_left(ticks, t_start)
+            if t_stop is not None:
+                t_stop = t_stop.rescale(unit).magnitude.item()
+                stop = bisect_right(ticks, t_stop)
+        start = min(max(start, 0), nsamples)
+        stop = min(max(stop, start), nsamples)
+        return start, stop
+
     def _mtag_eest_to_neo(self, nix_mtag, lazy):
+        """
+        Convert a NIX MultiTag to a Neo Epoch, Event, or SpikeTrain.
+
+        In lazy mode, the returned object contains no data, but its ``proxy``
+        attribute holds a DataArrayProxy for reading the times on demand.
+        Epochs and SpikeTrains with waveforms also get a ``durations_proxy`` and
+        ``waveforms_proxy`` respectively.
+
+        :param nix_mtag: a NIX MultiTag
+        :param lazy: Do not load data if True
+        :return: a Neo Epoch, Event, or SpikeTrain
+        """
         neo_attrs = self._nix_attr_to_neo(nix_mtag)
         neo_type = nix_mtag.type
 
@@ -346,6 +1027,8 @@ class NixIO(BaseIO):
                                   dtype="S")
             eest = Epoch(times=times, durations=durations, labels=labels,
                          **neo_attrs)
+            if lazy:
+                eest.durations_proxy = DataArrayProxy(nix_mtag.extents)
         elif neo_type == "neo.event":
             if lazy:
                 labels = np.empty(0, dtype='S')
@@ -360,23 +1043,26 @@ class NixIO(BaseIO):
                 wftime = self._get_time_dimension(wfda)
                 if lazy:
                     eest.waveforms = pq.Quantity(np.empty((0, 0, 0)), wfda.unit)
-                    eest.sampling_period = pq.Quantity(1, wftime.unit)
-                    eest.left_sweep = pq.Quantity(0, wftime.unit)
+                    eest.waveforms_proxy = DataArrayProxy(wfda)
                 else:
                     eest.waveforms = pq.Quantity(wfda, wfda.unit)
-                    eest.sampling_period = pq.Quantity(
-                        wftime.sampling_interval, wftime.unit
-                    )
-                    eest.left_sweep = pq.Quantity(wfda.metadata["left_sweep"],
-                                                  wftime.unit)
+                eest.sampling_period = pq.Quantity(
+                    wftime.sampling_interval, wftime.unit
+                )
+                if wfda.metadata is not None:
+                    wfmd = self._get_metadata_props(wfda.metadata)
+                    if "left_sweep" in wfmd:
+                        eest.left_sweep = pq.Quantity(wfmd["left_sweep"],
+                                                      wftime.unit)
         else:
             return None
-        self._object_map[nix_mtag.id] = eest
+        self._map_object(nix_mtag.id, eest)
         if lazy_shape:
             eest.lazy_shape = lazy_shape
+            eest.proxy = DataArrayProxy(nix_mtag.positions)
         return eest
 
-    def _read_cascade(self, nix_obj, path, cascade, lazy):
+    def _read_cascade(self, nix_obj, path, cascade, lazy, channels=None):
         neo_obj = self._object_map[nix_obj.id]
         for neocontainer in getattr(neo_obj, "_child_containers", []):
             nixcontainer = self._container_map[neocontainer]
@@ -386,14 +1072,25 @@ class NixIO(BaseIO):
                 neotype = "channelindex"
             else:
                 neotype = neocontainer[:-1]
-            chpaths = list(path + "/" + neocontainer + "/" + c.name
-                           for c in getattr(nix_obj, nixcontainer)
-                           if c.type == "neo." + neotype)
             if neocontainer in ("analogsignals",
                                 "irregularlysampledsignals"):
-                chpaths = self._group_signals(chpaths)
+                signal_groups = self._get_signal_groups(nix_obj)
+                chpaths = list(path + "/" + neocontainer + "/" + name
+                               for name, das in signal_groups.items()
+                               if das[0].type == "neo." + neotype and
+                               (channels is None or
+                                (channels and min(channels) <
+                                 self._signal_channel_count(das))))
+            else:
+                chpaths = list(path + "/" + neocontainer + "/" + c.name
+                               for c in getattr(nix_obj, nixcontainer)
+                               if c.type == "neo." + neotype)
             if cascade != "lazy":
                 read_func = getattr(self, "read_" + neotype)
+                if channels is not None and neotype in (
+                        "segment", "analogsignal", "irregularlysampledsignal"
+                ):
+                    read_func = partial(read_func, channels=channels)
                 children = list(read_func(cp, cascade, lazy)
                                 for cp in chpaths)
             else:
@@ -404,10 +1101,18 @@ class NixIO(BaseIO):
             # set references to signals
             parent_block_path = "/" + path.split("/")[1]
             parent_block = self._get_object_at(parent_block_path)
-            ref_das = self._get_referers(nix_obj, parent_block.data_arrays)
-            ref_signals = self._get_mapped_objects(ref_das)
-            # deduplicate by name
-            ref_signals = list(dict((s.name, s) for s in ref_signals).values())
+            ref_das = self._get_referers(nix_obj, parent_block, "data_arrays")
+            partials = self._block_partials or dict()
+            ref_signals = list()
+            for da in ref_das:
+                sig = self._get_mapped_object(da)
+                if sig is None:
+                    sig = partials.get(da.id)
+                ref_signals.append(sig)
+            # deduplicate by name (DataArrays of channels that were not read
+            # are not mapped)
+            ref_signals = list(dict((s.name, s) for s in ref_signals
+                                    if s is not None).values())
             for sig in ref_signals:
                 if isinstance(sig, AnalogSignal):
                     neo_obj.analogsignals.append(sig)
@@ -419,7 +1124,7 @@ class NixIO(BaseIO):
             # set references to spiketrains
             parent_block_path = "/" + path.split("/")[1]
             parent_block = self._get_object_at(parent_block_path)
-            ref_mtags = self._get_referers(nix_obj, parent_block.multi_tags)
+            ref_mtags = self._get_referers(nix_obj, parent_block, "multi_tags")
             ref_sts = self._get_mapped_objects(ref_mtags)
             for st in ref_sts:
                 neo_obj.spiketrains.append(st)
@@ -436,6 +1141,30 @@ class NixIO(BaseIO):
         read_func = getattr(self, "read_" + neotype)
         return read_func(path, cascade, lazy)
 
+    @staticmethod
+    def _relink_block(neo_block):
+        """
+        Sets the parent references of the children of a Block (and the
+        ChannelIndex and Unit references of signals and SpikeTrains) from the
+        Block's containers. Used for Blocks that were read in a different
+        process.
+
+        :param neo_block: A fully loaded Neo Block
+        """
+        for seg in neo_block.segments:
+            seg.block = neo_block
+            for child in (seg.analogsignals + seg.irregularlysampledsignals +
+                          seg.epochs + seg.events + seg.spiketrains):
+                child.segment = seg
+        for chx in neo_block.channel_indexes:
+            chx.block = neo_block
+            for sig in chx.analogsignals + chx.irregularlysampledsignals:
+                sig.channel_index = chx
+            for unit in chx.units:
+                unit.channel_index = chx
+                for st in unit.spiketrains:
+                    st.unit = unit
+
     def load_lazy_object(self, obj):
         return self.get(obj.path, cascade=False, lazy=False)
 
@@ -463,7 +1192,257 @@ class NixIO(BaseIO):
         for bl in neo_blocks:
             self.write_block(bl)
 
+    def compact(self, dst=None, storage_profile=None):
+        """
+        Copies the objects in the file to a new file, leaving behind the space
+        that HDF5 does not reclaim when objects are deleted or replaced (e.g.,
+        by rewriting modified objects). Datasets are copied one at a time, in
+        blocks of at most ``COPY_BUFFER_SIZE`` bytes, so that files larger
+        than the available memory can be compacted. Objects that are linked
+        from more than one location are copied once and linked again.
+        If ``dst`` is None, the file of the IO is replaced by the compacted
+        copy. The file is closed and opened again, so objects that were lazily
+        loaded from it need to be loaded again; objects that were read from or
+        written to it stay mapped to their NIX objects. If ``dst`` is given,
+        the file of the IO stays open and unchanged.
+
+        :param dst: Path of the compacted copy (optional)
+        :param storage_profile: Name of one of the ``STORAGE_PROFILES`` or a
+            dictionary of HDF5 chunking and filter settings per kind of data,
+            applied to the DataArrays as they are copied. If None, datasets
+            keep their chunking and filters.
+        :return: Number of bytes reclaimed (size of the file minus the size
+            of the copy)
+        """
+        if dst is None and self._mode == "ro":
+            raise ValueError("Cannot compact a file opened read-only in "
+                             "place. Specify a destination file.")
+        profile = None
+        if storage_profile is not None:
+            profile = self._get_storage_profile(storage_profile)
+        if dst is not None:
+            # HDF5 shares the file that is already open in this process, so
+            # data that has not been flushed is copied too
+            self._copy_file(dst, profile)
+            return os.path.getsize(self.filename) - os.path.getsize(dst)
+        fd, target = tempfile.mkstemp(
+            suffix=".nix", dir=os.path.dirname(os.path.abspath(self.filename))
+        )
+        os.close(fd)
+        state = self._get_file_state()
+        self.nix_file.close()
+        try:
+            self._copy_file(target, profile)
+            reclaimed = (os.path.getsize(self.filename) -
+                         os.path.getsize(target))
+            getattr(os, "replace", os.rename)(target, self.filename)
+        except Exception:
+            if os.path.exists(target):
+                os.remove(target)
+            raise
+        finally:
+            self._reopen_file(state)
+        return reclaimed
+
+    def _copy_file(self, target, profile):
+        """
+        Copies the HDF5 file of the IO to the target file.
+
+        :param target: Path of the copy
+        :param profile: Storage settings for the copied DataArrays or None
+        """
+        with h5py.File(self.filename, "r") as srcfile, \
+                h5py.File(target, "w") as dstfile:
+            self._copy_h5_attrs(srcfile, dstfile)
+            self._copy_h5_group(srcfile, dstfile, dict(), profile)
+
+    def _get_file_state(self):
+        """
+        Returns the locations of the NIX objects that the IO refers to by
+        object rather than by path or ID: the objects that Neo objects were
+        written to and the DataArrays of partially read signals. They are
+        resolved again from this state when the file is reopened.
+
+        :return: Tuple (dictionary of the id() of written Neo objects to the
+            paths of their NIX objects, dictionary of partial read keys to
+            lists of DataArray IDs)
+        """
+        def first(nixobj):
+            if isinstance(nixobj, list):
+                return nixobj[0] if nixobj else None
+            return nixobj
+
+        paths = dict()
+        for path, nixobj in self._path_map.items():
+            nixobj = first(nixobj)
+            if nixobj is not None:
+                paths[nixobj.id] = path
+        written = dict()
+        for key, nixobj in self._object_map.items():
+            nixobj = first(nixobj)
+            if (not isinstance(key, string_types) and nixobj is not None and
+                    nixobj.id in paths):
+                written[key] = paths[nixobj.id]
+        partials = dict((key, list(da.id for da in record["data_arrays"]))
+                        for key, record in self._partial_reads.items())
+        return written, partials
+
+    def _reopen_file(self, state=None):
+        """
+        Opens the file of the IO again (without truncating it) and drops all
+        references to objects of the previously open file. Lazily loaded
+        objects are released. Neo objects read from the file stay mapped to
+        the IDs of their NIX objects, which are kept by ``compact``. Neo
+        objects written to the file and partially read signals are mapped to
+        the NIX objects at the locations recorded by ``_get_file_state``
+        before the file was closed, or forgotten if no state is given.
+
+        :param state: State returned by ``_get_file_state`` or None
+        """
+        if self._mode == "ro":
+            filemode = nixio.FileMode.ReadOnly
+        else:
+            filemode = nixio.FileMode.ReadWrite
+        self.nix_file = nixio.File.open(self.filename, filemode, backend="h5py")
+        self.release_lazy()
+        written, partials = state or (dict(), dict())
+        for key in [k for k in self._object_map
+                    if not isinstance(k, string_types)]:
+            del self._object_map[key]
+        self._path_map.clear()
+        self._signal_groups.clear()
+        self._source_referers.clear()
+        self._metadata_cache.clear()
+        for key, path in written.items():
+            try:
+                self._object_map[key] = self._get_object_at(path)
+            except KeyError:
+                pass
+        for key, record in list(self._partial_reads.items()):
+            try:
+                stored = dict((da.id, da) for da in
+                              self._get_object_at(record["path"]))
+            except KeyError:
+                stored = dict()
+            daids = partials.get(key)
+            if not daids or not all(daid in stored for daid in daids):
+                del self._partial_reads[key]
+                continue
+            record["data_arrays"] = list(stored[daid] for daid in daids)
+
+    @classmethod
+    def _copy_h5_group(cls, src, dst, copied, profile):
+        """
+        Recursively copies the members of an HDF5 group.
+
+        :param src: Source h5py Group
+        :param dst: Destination h5py Group
+        :param copied: Dictionary mapping the source objects that have been
+            copied to their path in the destination file
+        :param profile: Storage settings per kind of data for the datasets of
+            DataArrays, or None to keep the settings of each dataset
+        """
+        for name in src:
+            link = src.get(name, getlink=True)
+            if isinstance(link, (h5py.SoftLink, h5py.ExternalLink)):
+                dst[name] = link
+                continue
+            obj = src[name]
+            if obj in copied:
+                dst[name] = dst.file[copied[obj]]
+            elif isinstance(obj, h5py.Group):
+                newgroup = dst.create_group(name)
+                copied[obj] = newgroup.name
+                cls._copy_h5_attrs(obj, newgroup)
+                cls._copy_h5_group(obj, newgroup, copied, profile)
+            elif isinstance(obj, h5py.Dataset):
+                settings = None
+                if profile is not None and name == "data":
+                    kind = cls._data_kind(src.attrs.get("type"))
+                    settings = profile.get(kind)
+                newdset = cls._copy_h5_dataset(obj, dst, name, settings)
+                copied[obj] = newdset.name
+            else:
+                src.copy(obj, dst, name=name)
+                copied[obj] = dst[name].name
+
+    @classmethod
+    def _copy_h5_dataset(cls, src, dstgroup, name, settings=None):
+        """
+        Copies an HDF5 dataset in blocks along its first axis.
+
+        :param src: Source h5py Dataset
+        :param dstgroup: Destination h5py Group
+        :param name: Name of the new dataset
+        :param settings: Chunking and filter settings for the new dataset
+            (see ``STORAGE_PROFILES``), or None to keep those of the source
+        :return: The new h5py Dataset
+        """
+        if not src.shape:
+            dst = dstgroup.create_dataset(name, data=src[()], dtype=src.dtype)
+            cls._copy_h5_attrs(src, dst)
+            return dst
+        if settings:
+            options = dict((k, v) for k, v in settings.items()
+                           if k != "chunks")
+            options["chunks"] = cls._chunk_shape(src.shape, src.dtype,
+                                                 settings)
+            options["maxshape"] = (None,) * len(src.shape)
+        else:
+            options = dict(chunks=src.chunks, maxshape=src.maxshape,
+                           compression=src.compression,
+                           compression_opts=src.compression_opts,
+                           shuffle=src.shuffle, fletcher32=src.fletcher32,
+                           scaleoffset=src.scaleoffset)
+        dst = dstgroup.create_dataset(name, shape=src.shape, dtype=src.dtype,
+                                      **options)
+        rowsize = src.dtype.itemsize * int(np.prod(src.shape[1:]))
+        step = max(COPY_BUFFER_SIZE // max(rowsize, 1), 1)
+        if src.chunks:
+            step = max(step // src.chunks[0], 1) * src.chunks[0]
+        for start in range(0, src.shape[0], step):
+            dst[start:start+step] = src[start:start+step]
+        cls._copy_h5_attrs(src, dst)
+        return dst
+
+    @staticmethod
+    def _copy_h5_attrs(src, dst):
+        for key in src.attrs:
+            dst.attrs.create(key, src.attrs[key],
+                             dtype=src.attrs.get_id(key).dtype)
+
+    @staticmethod
+    def _data_kind(typestr):
+        """
+        Returns the kind of data (see ``STORAGE_PROFILES``) held by a
+        DataArray of the given type, or None if the type is not one the NixIO
+        writes.
+
+        :param typestr: Type of the DataArray
+        :return: "signal", "times", "durations", "waveforms", or None
+        """
+        if isinstance(typestr, bytes):
+            typestr = typestr.decode()
+        if not isinstance(typestr, string_types):
+            return None
+        if typestr in ("neo.analogsignal", "neo.irregularlysampledsignal"):
+            return "signal"
+        if typestr == "neo.waveforms":
+            return "waveforms"
+        for kind in ("times", "durations"):
+            if typestr.endswith("." + kind):
+                return kind
+        return None
+
     def _write_object(self, obj, loc=""):
+        if self._names_resolved is None:
+            # outermost write: names resolved through a container stay
+            # resolved until it returns
+            self._names_resolved = set()
+            try:
+                return self._write_object(obj, loc)
+            finally:
+                self._names_resolved = None
         if isinstance(obj, Block):
             containerstr = "/"
         else:
@@ -472,27 +1451,321 @@ class NixIO(BaseIO):
                 containerstr = "/channel_indexes/"
             else:
                 containerstr = "/" + type(obj).__name__.lower() + "s/"
-        self.resolve_name_conflicts(obj)
+        if id(obj) not in self._names_resolved:
+            self.resolve_name_conflicts(obj)
+            self._names_resolved.update(map(id, self._name_scope(obj)))
         objpath = loc + containerstr + obj.name
-        oldhash = self._object_hashes.get(objpath)
-        newhash = self._hash_object(obj)
+        partial_record = self._get_partial(obj)
+        if partial_record is not None and partial_record["path"] == objpath:
+            self._write_partial(obj, partial_record)
+            return
+        if self._is_unmodified(objpath, obj):
+            self._object_map[id(obj)] = self._get_object_at(objpath)
+            self._write_cascade(obj, objpath)
+            return
+        oldhash = storedhash = self._object_hashes.get(objpath)
+        if (oldhash is None and (self._mode == "rw" or
+                                 objpath in self._unhashed_paths) and
+                self._is_stored_at(obj, objpath)):
+            storedhash, oldhash = self._get_file_hashes(objpath)
+        newhash = self._hash_object(obj, self._hash_factory,
+                                    self._hash_workers)
         if oldhash != newhash:
             attr = self._neo_attr_to_nix(obj)
             if isinstance(obj, pq.Quantity):
                 attr.update(self._neo_data_to_nix(obj))
             if oldhash is None:
                 nixobj = self._create_nix_obj(loc, attr)
+                self._path_map[objpath] = nixobj
             else:
                 nixobj = self._get_object_at(objpath)
+                if isinstance(obj, pq.Quantity):
+                    nixobj = self._overwrite_data(nixobj, attr, loc)
+                    self._path_map[objpath] = nixobj
             self._write_attr_annotations(nixobj, attr, objpath)
             if isinstance(obj, pq.Quantity):
                 self._write_data(nixobj, attr, objpath)
+            # cached metadata of the object is stale now
+            self._metadata_cache.clear()
         else:
             nixobj = self._get_object_at(objpath)
         self._object_map[id(obj)] = nixobj
+        if storedhash != newhash:
+            self._set_stored_hash(nixobj, newhash)
         self._object_hashes[objpath] = newhash
+        self._unhashed_paths.discard(objpath)
+        self._record_state(objpath, obj)
         self._write_cascade(obj, objpath)
 
+    def _write_partial(self, obj, record):
+        """
+        Writes the data of a partially read signal (see ``_record_partial``)
+        back to the part of the stored signal it was read from. Only the
+        selected samples of the selected channels are written; the rest of
+        the stored signal, its times, attributes, and annotations are left
+        as they are.
+        The signal is mapped to the DataArrays of the selected channels, so
+        that its ChannelIndex references are linked to them.
+
+        :param obj: The partially read Neo signal
+        :param record: The record of the partial read
+        """
+        path = record["path"]
+        start, stop = record["start"], record["stop"]
+        nix_data_arrays = self._get_object_at(path)
+        stored_ids = set(da.id for da in nix_data_arrays)
+        if not all(da.id in stored_ids for da in record["data_arrays"]):
+            raise ValueError("Signal {} was rewritten after it was read "
+                             "partially".format(path))
+        columns = record["columns"]
+        nchannels = self._signal_channel_count(record["data_arrays"], columns)
+        data = self._rescale_data(obj, nix_data_arrays[0].unit)
+        if data.shape != (stop - start, nchannels):
+            raise ValueError("Cannot write partially read signal {} with "
+                             "shape {} to {} samples of {} channels".format(
+                                 path, data.shape, stop - start, nchannels))
+        self._object_map[id(obj)] = list(record["data_arrays"])
+        newhash = self._hash_object(obj, self._hash_factory,
+                                    self._hash_workers)
+        if record["hash"] == newhash:
+            return
+        if columns is None:
+            targets = list((da, np.s_[start:stop], data[:, idx])
+                           for idx, da in enumerate(record["data_arrays"]))
+        else:
+            da = record["data_arrays"][0]
+            first = columns[0] if columns else 0
+            if columns == list(range(first, first + len(columns))):
+                targets = [(da, np.s_[start:stop, first:first+len(columns)],
+                            data)]
+            else:
+                targets = list((da, np.s_[start:stop, column], data[:, idx])
+                               for idx, column in enumerate(columns))
+        for da, selection, values in targets:
+            dataset = h5dataset(da)
+            if dataset is None:
+                da[selection] = values
+            else:
+                dataset[selection] = values
+        self._invalidate_hash(path, nix_data_arrays)
+        record["hash"] = newhash
+
+    def mark_modified(self, obj):
+        """
+        Marks an object as modified, so that it is hashed and compared with
+        the file the next time it is written. With snapshot change detection,
+        this is needed after changing the values of an array of the object in
+        place (e.g., ``signal[:] = values``), since snapshots record the
+        identity and memory layout of arrays, not their values. Replacing
+        arrays or attributes needs no marking.
+
+        :param obj: The Neo object (or path) to mark
+        """
+        if isinstance(obj, string_types):
+            self._object_states.pop(obj, None)
+            return
+        for path in [p for p, state in self._object_states.items()
+                     if state[0]() is obj]:
+            del self._object_states[path]
+
+    def _record_state(self, path, obj):
+        """
+        Records the snapshot of an object that has been read or written at
+        the given path, if snapshot change detection is used.
+
+        :param path: Location of the object in the file
+        :param obj: The Neo object
+        """
+        if self._change_detection == "snapshot":
+            self._object_states[path] = self._object_state(obj)
+
+    def _is_unmodified(self, path, obj):
+        """
+        Returns True if the snapshot of the object matches the one recorded
+        when the object at the given path was last read or written, i.e., if
+        the object can be skipped when writing without being hashed.
+
+        :param path: Location of the object in the file
+        :param obj: The Neo object
+        :return: True or False
+        """
+        oldstate = self._object_states.get(path)
+        if oldstate is None:
+            return False
+        newstate = self._object_state(obj)
+        if (oldstate[0]() is not obj or oldstate[1] != newstate[1] or
+                len(oldstate[2]) != len(newstate[2])):
+            return False
+        for (oldref, oldlayout), (newref, newlayout) in zip(oldstate[2],
+                                                            newstate[2]):
+            if oldref() is not newref() or oldlayout != newlayout:
+                return False
+        return True
+
+    @staticmethod
+    def _object_state(obj):
+        """
+        Returns a snapshot of the state of a Neo object that is cheap to
+        compute, covering what ``_hash_object`` hashes: the values of its
+        attributes, annotations, and scalar quantities, and the identity,
+        buffer address, shape, strides, and dtype of its arrays. The values in
+        arrays are not read, so they are not part of the snapshot.
+        Child objects are not included.
+
+        :param obj: A Neo object
+        :return: Tuple (weak reference to the object, attribute values,
+            list of (weak reference, layout) tuples for the arrays)
+        """
+        values = [type(obj).__name__, obj.name, obj.description]
+        arrays = list()
+
+        def add(value):
+            if not isinstance(value, np.ndarray):
+                values.append(str(value))
+            elif value.ndim == 0:
+                values.append((np.asarray(value).item(),
+                               str(getattr(value, "dimensionality", ""))))
+            else:
+                layout = (value.__array_interface__["data"][0], value.shape,
+                          value.strides, value.dtype.str,
+                          str(getattr(value, "dimensionality", "")))
+                arrays.append((weakref.ref(value), layout))
+
+        for k, v in sorted(obj.annotations.items()):
+            values.append(k)
+            add(v)
+        if isinstance(obj, (Block, Segment)):
+            add(obj.rec_datetime)
+            add(obj.file_datetime)
+        elif isinstance(obj, ChannelIndex):
+            add(obj.index)
+            add(obj.channel_names)
+            add(obj.coordinates)
+        elif isinstance(obj, (AnalogSignal, IrregularlySampledSignal, Event,
+                              Epoch, SpikeTrain)):
+            add(obj)
+            for attr in ("times", "durations", "labels", "waveforms",
+                         "t_start", "t_stop", "sampling_rate", "left_sweep"):
+                if attr == "times" and not isinstance(
+                        obj, IrregularlySampledSignal):
+                    continue
+                add(getattr(obj, attr, None))
+        return weakref.ref(obj), values, arrays
+
+    def _is_stored_at(self, obj, path):
+        """
+        Returns True if the Neo object was read from or written to the
+        location specified by the path by this IO. Only such objects are
+        compared with (and written over) the object stored at the location.
+        Other objects at the same location are written as new objects, which
+        fails if the name is already taken in the file.
+
+        :param obj: The Neo object
+        :param path: Location of the object in the file
+        :return: True or False
+        """
+        try:
+            nixobj = self._get_object_at(path)
+        except KeyError:
+            return False
+        if isinstance(nixobj, list):
+            if not nixobj:
+                return False
+            nixobj = nixobj[0]
+        if self._object_map.get(nixobj.id) is obj:
+            return True
+        written = self._object_map.get(id(obj))
+        if isinstance(written, list):
+            written = written[0] if written else None
+        return written is not None and written.id == nixobj.id
+
+    def _get_file_hashes(self, path):
+        """
+        Returns the hash stored with the object at the location specified by
+        the path and the hash of the object as it is stored in the file.
+        Hashes are stored with objects when they are written, so that objects
+        that are not modified are not rewritten when a file is opened again.
+        If no hash has been stored with the object, the object is read and
+        hashed.
+
+        :param path: Location of the object in the file
+        :return: Tuple (stored hash, object hash). Both are None if there is
+            no object at the location.
+        """
+        try:
+            nixobj = self._get_object_at(path)
+        except KeyError:
+            return None, None
+        if isinstance(nixobj, list) and not nixobj:
+            return None, None
+        storedhash = self._get_stored_hash(nixobj)
+        if storedhash is not None:
+            return storedhash, storedhash
+        return None, self._hash_stored_object(path)
+
+    @staticmethod
+    def _get_stored_hash(nixobj):
+        """
+        Returns the hash stored in the "neo.hash" HDF5 attribute of a NIX
+        object, or the first DataArray of a signal, or None if it has none.
+
+        :param nixobj: NIX object or list of DataArrays
+        :return: Stored hash or None
+        """
+        if isinstance(nixobj, list):
+            nixobj = nixobj[0]
+        h5group = getattr(nixobj, "_h5group", None)
+        if h5group is None:
+            return None
+        return stringify(h5group.group.attrs.get("neo.hash"))
+
+    @staticmethod
+    def _set_stored_hash(nixobj, objhash):
+        """
+        Stores the hash of the Neo object that was written to a NIX object in
+        its "neo.hash" HDF5 attribute (the first DataArray for signals).
+
+        :param nixobj: NIX object or list of DataArrays
+        :param objhash: The hash of the Neo object
+        """
+        if isinstance(nixobj, list):
+            nixobj = nixobj[0]
+        h5group = getattr(nixobj, "_h5group", None)
+        if h5group is not None:
+            h5group.group.attrs["neo.hash"] = objhash
+
+    def _hash_stored_object(self, path):
+        """
+        Computes the hash of the object stored in the file at the location
+        specified by the path. The object is read without its children and
+        without any effect on the state of the IO: the object map, metadata
+        cache, lazy-object registry, recorded snapshots, partial reads, and
+        the set of unhashed paths are swapped out while it is read.
+        Objects that are read from the file are not hashed when they are read.
+        If no hash was stored with them when they were written, their hashes
+        are computed from the file with this method the first time they are
+        written, in order to determine whether they were modified.
+
+        :param path: Location of the object in the file
+        :return: Hash of the stored object
+        """
+        names = ("_object_map", "_object_keys", "_metadata_cache",
+                 "_lazy_loaded", "_object_states", "_unhashed_paths",
+                 "_partial_reads")
+        saved = dict((name, getattr(self, name)) for name in names)
+        for name, value in saved.items():
+            setattr(self, name, type(value)())
+        block_partials = self._block_partials
+        self._block_partials = None
+        try:
+            neoobj = self.get(path, cascade=False, lazy=False)
+        finally:
+            for name, value in saved.items():
+                setattr(self, name, value)
+            self._block_partials = block_partials
+        return self._hash_object(neoobj, self._hash_factory,
+                                 self._hash_workers)
+
     def _create_nix_obj(self, loc, attr):
         parentobj = self._get_object_at(loc)
         if attr["type"] == "block":
@@ -509,18 +1782,28 @@ class NixIO(BaseIO):
             typestr = "neo." + attr["type"]
             parentmd = self._get_or_init_metadata(parentobj, loc)
             sigmd = parentmd.create_section(attr["name"], typestr+".metadata")
-            for idx, datarow in enumerate(attr["data"]):
-                name = "{}.{}".format(attr["name"], idx)
-                da = parentblock.create_data_array(name, typestr, data=datarow)
+            data = np.asarray(attr["data"])
+            if self._use_matrix_layout(attr["name"]):
+                da = self._create_data_array(parentblock, attr["name"],
+                                             typestr, data, "signal")
                 da.metadata = sigmd
                 nixobj.append(da)
+            else:
+                for idx in range(data.shape[1]):
+                    name = "{}.{}".format(attr["name"], idx)
+                    da = self._create_data_array(parentblock, name, typestr,
+                                                 data, "signal", column=idx)
+                    da.metadata = sigmd
+                    nixobj.append(da)
             parentobj.data_arrays.extend(nixobj)
+            if parentobj.id in self._signal_groups:
+                self._signal_groups[parentobj.id][attr["name"]] = nixobj
         elif attr["type"] in ("epoch", "event", "spiketrain"):
             blockpath = "/" + loc.split("/")[1]
             parentblock = self._get_object_at(blockpath)
-            timesda = parentblock.create_data_array(
-                attr["name"]+".times", "neo."+attr["type"]+".times",
-                data=attr["data"]
+            timesda = self._create_data_array(
+                parentblock, attr["name"]+".times",
+                "neo."+attr["type"]+".times", attr["data"], "times"
             )
             nixobj = parentblock.create_multi_tag(
                 attr["name"], "neo."+attr["type"], timesda
@@ -532,6 +1815,239 @@ class NixIO(BaseIO):
             raise ValueError("Unable to create NIX object. Invalid type.")
         return nixobj
 
+    def _create_data_array(self, parentblock, name, typestr, data, kind,
+                           column=None):
+        """
+        Creates a DataArray in the given Block using the HDF5 chunking and
+        filter settings of the storage profile for the kind of data. If the
+        profile has no settings for the kind, the DataArray is created with
+        the defaults of nixio.
+        Datasets are always created resizable along all axes, so that data can
+        be appended to them.
+        If ``column`` is given, the DataArray holds only that column of the
+        2-D ``data``. Data is written straight from the buffer of ``data``,
+        selecting the column as a hyperslab of it, so C-ordered data is never
+        copied.
+
+        :param parentblock: The NIX Block that will contain the DataArray
+        :param name: Name of the new DataArray
+        :param typestr: Type of the new DataArray
+        :param data: Data of the new DataArray
+        :param kind: Kind of data ("signal", "times", "durations",
+            "waveforms")
+        :param column: Index of the column of ``data`` to write (optional)
+        :return: The new DataArray
+        """
+        data = np.asarray(data)
+        shape = data.shape if column is None else data.shape[:1]
+        da = parentblock.create_data_array(name, typestr, dtype=data.dtype,
+                                           shape=shape)
+        settings = self._storage_profile.get(kind)
+        if settings:
+            self._apply_storage_settings(da, settings)
+        self._write_array(da, data, column)
+        return da
+
+    @classmethod
+    def _apply_storage_settings(cls, da, settings):
+        """
+        Recreates the (still empty) HDF5 dataset of a new DataArray with the
+        chunking and filter settings of a storage profile.
+        nixio creates the datasets of DataArrays with its own chunk shape and
+        filters and offers no way to choose them, so the dataset is replaced
+        through h5py right after the DataArray is created, before any data is
+        written to it. This is the only place where the NixIO bypasses nixio
+        to create datasets.
+
+        :param da: A new NIX DataArray
+        :param settings: Chunking and filter settings (see
+            ``STORAGE_PROFILES``)
+        """
+        dataset = h5dataset(da)
+        if dataset is None:
+            return
+        shape, dtype = dataset.shape, dataset.dtype
+        options = dict((k, v) for k, v in settings.items() if k != "chunks")
+        h5group = dataset.parent
+        del h5group["data"]
+        h5group.create_dataset("data", shape=shape, dtype=dtype,
+                               chunks=cls._chunk_shape(shape, dtype, settings),
+                               maxshape=(None,) * len(shape), **options)
+
+    @staticmethod
+    def _chunk_shape(shape, dtype, settings):
+        """
+        Returns the HDF5 chunk shape for a dataset from the chunking settings
+        of a storage profile: the number of elements along the first (time)
+        axis given by the settings and the full extent of the other axes.
+        Chunks larger than ``MAX_CHUNK_SIZE`` bytes (e.g., of signals with
+        many channels) are shrunk by halving their longest axis, so that
+        the other axes are chunked too if needed.
+
+        :param shape: Shape of the dataset
+        :param dtype: dtype of the dataset
+        :param settings: Chunking and filter settings (see
+            ``STORAGE_PROFILES``)
+        :return: Tuple of chunk lengths, or True to let h5py choose them
+        """
+        if "chunks" not in settings or not len(shape):
+            return True
+        chunks = [max(int(settings["chunks"]), 1)]
+        chunks.extend(max(n, 1) for n in shape[1:])
+        itemsize = np.dtype(dtype).itemsize
+        while itemsize * int(np.prod(chunks)) > MAX_CHUNK_SIZE:
+            longest = chunks.index(max(chunks))
+            if chunks[longest] == 1:
+                break
+            chunks[longest] = (chunks[longest] + 1) // 2
+        return tuple(chunks)
+
+    def _write_data_array(self, parentblock, name, typestr, data, kind,
+                          column=None, parent=None):
+        """
+        Writes data to the DataArray with the given name. An existing
+        DataArray is overwritten in place if its dtype matches the data and
+        it is explicitly resized if only its shape differs. Otherwise, the
+        DataArray is (re)created with ``_create_data_array``.
+
+        :param parentblock: The NIX Block that contains the DataArray
+        :param name: Name of the DataArray
+        :param typestr: Type of the DataArray if it is created
+        :param data: Data to write
+        :param kind: Kind of data (see ``_create_data_array``)
+        :param column: Index of the column of ``data`` to write (optional)
+        :param parent: NIX Group that links the DataArray (optional)
+        :return: Tuple (DataArray, True if the DataArray was created)
+        """
+        if name in parentblock.data_arrays:
+            da = parentblock.data_arrays[name]
+            if self._overwrite_data_array(da, data, column):
+                return da, False
+            if parent is not None and name in parent.data_arrays:
+                del parent.data_arrays[name]
+            del parentblock.data_arrays[name]
+        da = self._create_data_array(parentblock, name, typestr, data, kind,
+                                     column)
+        if parent is not None:
+            parent.data_arrays.append(da)
+        return da, True
+
+    @classmethod
+    def _overwrite_data_array(cls, da, data, column=None):
+        """
+        Overwrites the data of a DataArray in place, resizing its dataset if
+        the shape of the data differs.
+
+        :param da: NIX DataArray
+        :param data: Data to write
+        :param column: Index of the column of ``data`` to write (optional)
+        :return: True if the data was written, False if the DataArray cannot
+            hold it (different dtype or dimensionality, or not resizable to
+            the new shape)
+        """
+        data = np.asarray(data)
+        shape = data.shape if column is None else data.shape[:1]
+        if da.dtype != data.dtype or len(da.shape) != len(shape):
+            return False
+        if tuple(da.shape) != shape:
+            dataset = h5dataset(da)
+            if dataset is not None:
+                if any(m is not None and n > m
+                       for n, m in zip(shape, dataset.maxshape)):
+                    return False
+                dataset.resize(shape)
+            else:
+                da.data_extent = shape
+        cls._write_array(da, data, column)
+        return True
+
+    @staticmethod
+    def _write_array(da, data, column=None):
+        """
+        Writes data to a DataArray of matching shape. C-ordered data is written
+        to HDF5 straight from its buffer, selecting the column as a hyperslab
+        if one is given.
+
+        :param da: NIX DataArray
+        :param data: Data to write
+        :param column: Index of the column of ``data`` to write (optional)
+        """
+        if not data.size:
+            return
+        source_sel = None if column is None else np.s_[:, column]
+        dataset = h5dataset(da)
+        if dataset is None:
+            da.write_direct(data if source_sel is None else data[source_sel])
+        elif data.flags["C_CONTIGUOUS"]:
+            dataset.write_direct(data, source_sel=source_sel)
+        elif source_sel is None:
+            dataset[...] = data
+        else:
+            dataset[...] = data[source_sel]
+
+    def _overwrite_data(self, nixobj, attr, loc):
+        """
+        Writes the data of a modified signal, Epoch, Event, or SpikeTrain to
+        the NIX objects it was previously written to, in place where the
+        stored DataArrays can hold it. A signal keeps the layout it is stored
+        in. DataArrays are created for new channels and deleted for removed
+        ones.
+
+        :param nixobj: The NIX object or the list of DataArrays of a signal
+        :param attr: Attributes of the Neo object (from ``_neo_attr_to_nix``
+            and ``_neo_data_to_nix``)
+        :param loc: Path to the parent of the object
+        :return: The NIX object or the list of DataArrays of the signal
+        """
+        blockpath = "/" + loc.split("/")[1]
+        parentblock = self._get_object_at(blockpath)
+        typestr = "neo." + attr["type"]
+        if not isinstance(nixobj, list):
+            timesda, created = self._write_data_array(
+                parentblock, attr["name"] + ".times", typestr + ".times",
+                attr["data"], "times"
+            )
+            if created:
+                nixobj.positions = timesda
+            return nixobj
+        parentobj = self._get_object_at(loc)
+        sigmd = nixobj[0].metadata
+        data = np.asarray(attr["data"])
+        if self._is_matrix_signal(nixobj):
+            columns = [(attr["name"], None)]
+        else:
+            columns = list(("{}.{}".format(attr["name"], idx), idx)
+                           for idx in range(data.shape[1]))
+        dataarrays = list()
+        for name, column in columns:
+            da, created = self._write_data_array(parentblock, name, typestr,
+                                                 data, "signal", column,
+                                                 parentobj)
+            if created:
+                da.metadata = sigmd
+            dataarrays.append(da)
+        for da in nixobj[len(columns):]:
+            del parentobj.data_arrays[da.name]
+            del parentblock.data_arrays[da.name]
+        if parentobj.id in self._signal_groups:
+            self._signal_groups[parentobj.id][attr["name"]] = dataarrays
+        return dataarrays
+
+    def _use_matrix_layout(self, signame):
+        """
+        Returns True if a signal with the given name is to be written as a
+        single 2-D DataArray. Signals whose names end in a numeric suffix are
+        always written in the split layout, since the suffix would be read as
+        a channel index.
+
+        :param signame: Name of the signal
+        :return: True or False
+        """
+        if self._signal_layout != "2d":
+            return False
+        name, _, idx = signame.rpartition(".")
+        return not (name and idx.isdigit())
+
     def write_block(self, bl, loc=""):
         """
         Convert ``bl`` to the NIX equivalent and write it to the file.
@@ -598,6 +2114,7 @@ class NixIO(BaseIO):
                     del chanmd["coordinates"]
                 chanmd.create_property("coordinates", nixcoords)
                 chanmd["coordinates.units"] = nixcoordunits
+        self._metadata_cache.clear()
 
     def write_analogsignal(self, anasig, loc=""):
         """
@@ -625,6 +2142,120 @@ class NixIO(BaseIO):
         """
         self._write_object(irsig, loc)
 
+    def append_analogsignal(self, path, samples):
+        """
+        Appends samples to the end of the AnalogSignal stored at the location
+        specified by the path. Each channel DataArray is extended along the
+        time axis and only the new samples are written; the existing data is
+        not read.
+
+        :param path: Location of the AnalogSignal in the file
+        :param samples: Quantity array or AnalogSignal of shape
+            (samples, channels), or (samples,) for single channel signals.
+            Arrays without units are assumed to be in the units of the signal.
+        """
+        nix_data_arrays, _ = self._get_signal_data_arrays(path)
+        if nix_data_arrays[0].type != "neo.analogsignal":
+            raise ValueError("Object at {} is not an AnalogSignal".format(path))
+        data = self._rescale_data(samples, nix_data_arrays[0].unit)
+        if data.ndim == 1:
+            data = data[:, np.newaxis]
+        nchannels = self._signal_channel_count(nix_data_arrays)
+        if data.shape[1] != nchannels:
+            raise ValueError("Cannot append {} channels to signal {} with {} "
+                             "channels".format(data.shape[1], path, nchannels))
+        if self._is_matrix_signal(nix_data_arrays):
+            self._append_data(nix_data_arrays[0], data)
+        else:
+            for idx, da in enumerate(nix_data_arrays):
+                self._append_data(da, data[:, idx])
+        self._invalidate_hash(path, nix_data_arrays)
+
+    def append_eest(self, path, times, durations=None, labels=None,
+                    waveforms=None, t_stop=None):
+        """
+        Appends events to the end of the Epoch, Event, or SpikeTrain stored at
+        the location specified by the path. The positions DataArray of the
+        MultiTag (and its extents, waveforms, and labels) are extended in place
+        and only the new values are written.
+
+        :param path: Location of the object in the file
+        :param times: Quantity array of the new times
+        :param durations: Quantity array of the new durations (Epochs only)
+        :param labels: Labels of the new times (Epochs and Events only). Empty
+            labels are stored if None.
+        :param waveforms: Quantity array of the new waveforms (SpikeTrains
+            with waveforms only)
+        :param t_stop: New t_stop of a SpikeTrain. If None, t_stop is extended
+            to the last appended spike if necessary.
+        """
+        nix_mtag = self._get_object_at(path)
+        neo_type = nix_mtag.type
+        positions = nix_mtag.positions
+        times = self._rescale_data(times, positions.unit).reshape(-1)
+        count = len(times)
+
+        if neo_type == "neo.epoch":
+            if durations is None:
+                raise ValueError("Durations are required for appending to "
+                                 "Epoch {}".format(path))
+            durations = self._rescale_data(durations,
+                                           nix_mtag.extents.unit).reshape(-1)
+            if len(durations) != count:
+                raise ValueError("Number of durations does not match number "
+                                 "of times")
+        if neo_type in ("neo.epoch", "neo.event"):
+            if labels is None:
+                labels = [""] * count
+            labels = list(stringify(l) for l in labels)
+            if len(labels) != count:
+                raise ValueError("Number of labels does not match number "
+                                 "of times")
+        if neo_type == "neo.spiketrain":
+            wfda = None
+            if len(nix_mtag.features):
+                wfda = nix_mtag.features[0].data
+            if (waveforms is None) != (wfda is None):
+                raise ValueError("Waveforms must be appended if and only if "
+                                 "SpikeTrain {} has waveforms".format(path))
+            if wfda is not None:
+                waveforms = self._rescale_data(waveforms, wfda.unit)
+                if (len(waveforms) != count or
+                        tuple(waveforms.shape[1:]) != tuple(wfda.shape[1:])):
+                    raise ValueError("Shape of waveforms does not match "
+                                     "SpikeTrain {}".format(path))
+
+        self._append_data(positions, times)
+        if neo_type == "neo.epoch":
+            self._append_data(nix_mtag.extents, durations)
+        if neo_type in ("neo.epoch", "neo.event") and len(positions.dimensions):
+            labeldim = positions.dimensions[0]
+            if isinstance(labeldim, nixtypes["SetDimension"]):
+                self._append_labels(labeldim, labels)
+        if neo_type == "neo.spiketrain":
+            if wfda is not None:
+                self._append_data(wfda, waveforms)
+            metadata = nix_mtag.metadata
+            if t_stop is not None:
+                t_stop = self._rescale_data(t_stop, positions.unit).item()
+            elif count:
+                t_stop = max(metadata["t_stop"], times.max().item())
+            if t_stop is not None:
+                metadata["t_stop"] = self._to_value(t_stop)
+            self._metadata_cache.clear()
+        self._invalidate_hash(path, nix_mtag)
+
+    def append_epoch(self, path, times, durations, labels=None):
+        return self.append_eest(path, times, durations=durations,
+                                labels=labels)
+
+    def append_event(self, path, times, labels=None):
+        return self.append_eest(path, times, labels=labels)
+
+    def append_spiketrain(self, path, times, waveforms=None, t_stop=None):
+        return self.append_eest(path, times, waveforms=waveforms,
+                                t_stop=t_stop)
+
     def write_epoch(self, ep, loc=""):
         """
         Convert the provided ``ep`` (Epoch) to a NIX MultiTag and write it to
@@ -696,13 +2327,23 @@ class NixIO(BaseIO):
         :param block: A Neo Block that has already been converted and mapped to
          NIX objects.
         """
+        nix_block = self._get_mapped_object(block)
+        self._source_referers.pop(nix_block.id, None)
         for seg in block.segments:
             group = self._get_mapped_object(seg)
             group_signals = self._get_contained_signals(group)
             for mtag in group.multi_tags:
                 if mtag.type in ("neo.epoch", "neo.event"):
-                    mtag.references.extend([sig for sig in group_signals
-                                            if sig not in mtag.references])
+                    self._link_missing(mtag.references, group_signals)
+        # collect the sources of each object first, so that the existing
+        # links of each object are only read once
+        object_sources = OrderedDict()
+
+        def add_source(nixobj, source):
+            object_sources.setdefault(nixobj.id, (nixobj, list()))[1].append(
+                source
+            )
+
         for rcg in block.channel_indexes:
             rcgsource = self._get_mapped_object(rcg)
             das = self._get_mapped_objects(rcg.analogsignals +
@@ -710,16 +2351,34 @@ class NixIO(BaseIO):
             # flatten nested lists
             das = [da for dalist in das for da in dalist]
             for da in das:
-                if rcgsource not in da.sources:
-                    da.sources.append(rcgsource)
+                add_source(da, rcgsource)
             for unit in rcg.units:
                 unitsource = self._get_mapped_object(unit)
                 for st in unit.spiketrains:
                     stmtag = self._get_mapped_object(st)
-                    if rcgsource not in stmtag.sources:
-                        stmtag.sources.append(rcgsource)
-                    if unitsource not in stmtag.sources:
-                        stmtag.sources.append(unitsource)
+                    add_source(stmtag, rcgsource)
+                    add_source(stmtag, unitsource)
+        for nixobj, sources in object_sources.values():
+            self._link_missing(nixobj.sources, sources)
+
+    @staticmethod
+    def _link_missing(links, objects):
+        """
+        Adds the objects that are not already in a NIX link container
+        (references or sources) to it in a single operation. The IDs of the
+        existing links are read once.
+
+        :param links: NIX link container
+        :param objects: List of NIX objects to link
+        """
+        linked = set(obj.id for obj in links)
+        missing = list()
+        for obj in objects:
+            if obj.id not in linked:
+                linked.add(obj.id)
+                missing.append(obj)
+        if missing:
+            links.extend(missing)
 
     def _get_or_init_metadata(self, nix_obj, path):
         """
@@ -754,6 +2413,11 @@ class NixIO(BaseIO):
         identified by the second-to-last part of the path string, a list of
         (DataArray) objects is returned.
 
+        Resolved objects are kept in a path cache, so that subsequent lookups
+        of the same path (or any of its children) do not need to walk the
+        hierarchy from the file root again. Objects created by the NixIO are
+        added to the cache when they are written.
+
         Example path: /block_1/segments/segment_a/events/event_a1
 
         :param path: Path string
@@ -761,27 +2425,108 @@ class NixIO(BaseIO):
         """
         if path in ("", "/"):
             return self.nix_file
+        if path in self._path_map:
+            return self._path_map[path]
         parts = path.split("/")
         if parts[0]:
             ValueError("Invalid object path: {}".format(path))
         if len(parts) == 2:  # root block
-            return self.nix_file.blocks[parts[1]]
+            obj = self.nix_file.blocks[parts[1]]
+            self._path_map[path] = obj
+            return obj
         parent_obj = self._get_parent(path)
-        container_name = self._container_map[parts[-2]]
-        parent_container = getattr(parent_obj, container_name)
         objname = parts[-1]
         if parts[-2] in ["analogsignals", "irregularlysampledsignals"]:
-            obj = list()
-            for idx in itertools.count():
-                name = "{}.{}".format(objname, idx)
-                if name in parent_container:
-                    obj.append(parent_container[name])
-                else:
-                    break
+            obj = list(self._get_signal_groups(parent_obj).get(objname, []))
+            if not obj:
+                return obj
         else:
+            container_name = self._container_map[parts[-2]]
+            parent_container = getattr(parent_obj, container_name)
             obj = parent_container[objname]
+        self._path_map[path] = obj
         return obj
 
+    def _get_signal_groups(self, nix_obj):
+        """
+        Returns an index of the signals contained in a NIX Block or Group,
+        mapping each signal name to the list of DataArrays that make up its
+        channels, ordered by channel index.
+        DataArrays whose names end in a numeric suffix ("{name}.{idx}") are
+        channels of a signal stored in the split layout. Any other signal
+        DataArray holds a whole signal in the 2-D layout and is mapped as a
+        list of one DataArray.
+        The index is built in a single scan of the object's DataArrays the
+        first time it is requested and is kept up to date as new signals are
+        written.
+
+        :param nix_obj: NIX Block or Group
+        :return: OrderedDict of signal names to lists of DataArrays
+        """
+        if nix_obj.id in self._signal_groups:
+            return self._signal_groups[nix_obj.id]
+        channels = OrderedDict()
+        for da in nix_obj.data_arrays:
+            if da.type not in ("neo.analogsignal",
+                               "neo.irregularlysampledsignal"):
+                continue
+            name, _, idx = da.name.rpartition(".")
+            if name and idx.isdigit():
+                channels.setdefault(name, list()).append((int(idx), da))
+            else:
+                channels.setdefault(da.name, list()).append((0, da))
+        signal_groups = OrderedDict()
+        for name, chanlist in channels.items():
+            signal_groups[name] = list(da for _, da in
+                                       sorted(chanlist, key=lambda c: c[0]))
+        self._signal_groups[nix_obj.id] = signal_groups
+        return signal_groups
+
+    @staticmethod
+    def _get_channel_positions(nix_block, channels):
+        """
+        Converts a channel selection into a list of channel positions (indices
+        into the channel dimension of signals).
+        The selection can be a Neo ChannelIndex, in which case its ``index`` is
+        used, or a list of channel positions and/or channel names. Channel
+        names are looked up in the ChannelIndex Sources of the given Block.
+
+        :param nix_block: The NIX Block containing the channels
+        :param channels: Channel selection or None
+        :return: List of channel positions or None if nothing was selected
+        """
+        if channels is None:
+            return None
+        if isinstance(channels, ChannelIndex):
+            return list(int(idx) for idx in channels.index)
+        if isinstance(channels, (string_types, bytes)):
+            channels = [channels]
+        names = dict()
+        positions = list()
+        for chan in channels:
+            if isinstance(chan, (string_types, bytes)):
+                if not names:
+                    for chx in nix_block.sources:
+                        if chx.type != "neo.channelindex":
+                            continue
+                        for src in chx.sources:
+                            if src.type == "neo.channelindex":
+                                names.setdefault(src.name,
+                                                 src.metadata["index"])
+                try:
+                    positions.append(int(names[stringify(chan)]))
+                except KeyError:
+                    raise ValueError("Channel {} not found in Block {}".format(
+                        stringify(chan), nix_block.name
+                    ))
+            else:
+                positions.append(int(chan))
+        negative = list(pos for pos in positions if pos < 0)
+        if negative:
+            raise ValueError("Invalid channel positions {}: positions must "
+                             "not be negative".format(negative))
+        return positions
+
     def _get_parent(self, path):
         parts = path.split("/")
         parent_path = "/".join(parts[:-2])
@@ -827,7 +2572,14 @@ class NixIO(BaseIO):
         if isinstance(nixobj, list):
             for obj in nixobj:
                 obj.unit = attr["dataunits"]
-                if attr["type"] == "analogsignal":
+                if len(obj.dimensions):
+                    timedim = obj.dimensions[0]
+                    if attr["type"] == "analogsignal":
+                        timedim.sampling_interval = attr["sampling_interval"]
+                    elif not self._write_in_place(timedim, "ticks",
+                                                  attr["times"]):
+                        timedim.ticks = attr["times"]
+                elif attr["type"] == "analogsignal":
                     timedim = obj.append_sampled_dimension(
                         attr["sampling_interval"]
                     )
@@ -836,7 +2588,8 @@ class NixIO(BaseIO):
                 timedim.unit = attr["timeunits"]
                 timedim.label = "time"
                 timedim.offset = attr["t_start"]
-                obj.append_set_dimension()
+                if len(obj.dimensions) < 2:
+                    obj.append_set_dimension()
         else:
             nixobj.positions.unit = attr["timeunits"]
             blockpath = "/" + path.split("/")[1]
@@ -844,18 +2597,21 @@ class NixIO(BaseIO):
             if "extents" in attr:
                 extname = nixobj.name + ".durations"
                 exttype = nixobj.type + ".durations"
-                if extname in parentblock.data_arrays:
-                    del parentblock.data_arrays[extname]
-                extents = parentblock.create_data_array(
-                    extname,
-                    exttype,
-                    data=attr["extents"]
+                extents, created = self._write_data_array(
+                    parentblock, extname, exttype, attr["extents"], "durations"
                 )
                 extents.unit = attr["extentunits"]
-                nixobj.extents = extents
+                if created:
+                    nixobj.extents = extents
             if "labels" in attr:
-                labeldim = nixobj.positions.append_set_dimension()
-                labeldim.labels = attr["labels"]
+                if len(nixobj.positions.dimensions):
+                    labeldim = nixobj.positions.dimensions[0]
+                    if not self._write_in_place(labeldim, "labels",
+                                                attr["labels"]):
+                        labeldim.labels = attr["labels"]
+                else:
+                    labeldim = nixobj.positions.append_set_dimension()
+                    labeldim.labels = attr["labels"]
             metadata = self._get_or_init_metadata(nixobj, path)
             if "t_start" in attr:
                 metadata["t_start"] = self._to_value(attr["t_start"])
@@ -863,20 +2619,24 @@ class NixIO(BaseIO):
                 metadata["t_stop"] = self._to_value(attr["t_stop"])
             if "waveforms" in attr:
                 wfname = nixobj.name + ".waveforms"
-                if wfname in parentblock.data_arrays:
-                    del parentblock.data_arrays[wfname]
-                    del nixobj.features[0]
-                wfda = parentblock.create_data_array(
-                    wfname, "neo.waveforms",
-                    data=attr["waveforms"]
+                replaced = wfname in parentblock.data_arrays
+                wfda, created = self._write_data_array(
+                    parentblock, wfname, "neo.waveforms", attr["waveforms"],
+                    "waveforms"
                 )
                 wfda.unit = attr["waveformunits"]
-                nixobj.create_feature(wfda, nixio.LinkType.Indexed)
-                wfda.append_set_dimension()
-                wfda.append_set_dimension()
-                wftime = wfda.append_sampled_dimension(
-                    attr["sampling_interval"]
-                )
+                if created:
+                    if replaced:
+                        del nixobj.features[0]
+                    nixobj.create_feature(wfda, nixio.LinkType.Indexed)
+                    wfda.append_set_dimension()
+                    wfda.append_set_dimension()
+                    wftime = wfda.append_sampled_dimension(
+                        attr["sampling_interval"]
+                    )
+                else:
+                    wftime = wfda.dimensions[2]
+                    wftime.sampling_interval = attr["sampling_interval"]
                 wftime.unit = attr["timeunits"]
                 wftime.label = "time"
                 if wfname in metadata.sections:
@@ -889,29 +2649,178 @@ class NixIO(BaseIO):
                         attr["left_sweep"]
                     )
 
+    @staticmethod
+    def _write_in_place(nix_obj, name, values):
+        """
+        Overwrites the values of the dataset with the given name of a NIX
+        object (e.g., the ticks of a RangeDimension or the labels of a
+        SetDimension) in place, if it holds as many values as given.
+
+        :param nix_obj: NIX object
+        :param name: Name of the dataset
+        :param values: List or array of new values
+        :return: True if the values were written, False otherwise
+        """
+        h5group = getattr(nix_obj, "_h5group", None)
+        if h5group is None or name not in h5group.group:
+            return False
+        dset = h5group.group[name]
+        if dset.shape != (len(values),):
+            return False
+        dset[...] = values
+        return True
+
+    @staticmethod
+    def _append_data(nix_da, data):
+        """
+        Extends a NIX DataArray along its first axis and writes the given data
+        into the new part. The underlying HDF5 dataset is resized in place.
+
+        :param nix_da: NIX DataArray
+        :param data: Array of values to append
+        """
+        start = len(nix_da)
+        if not len(data):
+            return
+        dset = h5dataset(nix_da)
+        if dset is not None:
+            dset.resize(start + len(data), axis=0)
+            dset[start:] = data
+        else:
+            extent = tuple(nix_da.data_extent)
+            nix_da.data_extent = (start + len(data),) + extent[1:]
+            nix_da[start:] = data
+
+    @staticmethod
+    def _append_labels(labeldim, labels):
+        """
+        Appends labels to a NIX SetDimension. The labels dataset is resized in
+        place if it exists.
+
+        :param labeldim: NIX SetDimension
+        :param labels: List of labels to append
+        """
+        if not labels:
+            return
+        h5group = getattr(labeldim, "_h5group", None)
+        if h5group is not None and "labels" in h5group.group:
+            dset = h5group.group["labels"]
+            start = len(dset)
+            dset.resize(start + len(labels), axis=0)
+            dset[start:] = labels
+        else:
+            labeldim.labels = tuple(labeldim.labels or ()) + tuple(labels)
+
+    @staticmethod
+    def _rescale_data(values, units):
+        """
+        Returns the magnitude of a Quantity array in the given units. Values
+        without units are returned unchanged.
+
+        :param values: Quantity or numpy array
+        :param units: Target units (string) or None for dimensionless
+        :return: numpy array
+        """
+        if isinstance(values, pq.Quantity):
+            values = values.rescale(units or pq.dimensionless).magnitude
+        return np.asarray(values)
+
+    def _invalidate_hash(self, path, nixobj):
+        """
+        Drops the known and stored hashes of an object whose data was changed
+        in the file, so that it is compared against the file the next time it
+        is written.
+
+        :param path: Location of the object in the file
+        :param nixobj: NIX object or list of DataArrays
+        """
+        self._object_hashes.pop(path, None)
+        self._object_states.pop(path, None)
+        self._unhashed_paths.add(path)
+        if isinstance(nixobj, list):
+            nixobj = nixobj[0]
+        h5group = getattr(nixobj, "_h5group", None)
+        if h5group is not None and "neo.hash" in h5group.group.attrs:
+            del h5group.group.attrs["neo.hash"]
+
     def _update_maps(self, obj, lazy):
-        objidx = self._find_lazy_loaded(obj)
-        if lazy and objidx is None:
-            self._lazy_loaded.append(obj)
-        elif not lazy and objidx is not None:
-            self._lazy_loaded.pop(objidx)
-        if not lazy:
-            self._object_hashes[obj.path] = self._hash_object(obj)
+        if lazy:
+            self._lazy_loaded.setdefault(obj.path, obj)
+        else:
+            self._lazy_loaded.pop(obj.path, None)
+            if obj.path not in self._object_hashes:
+                self._unhashed_paths.add(obj.path)
+            self._record_state(obj.path, obj)
 
     def _find_lazy_loaded(self, obj):
         """
-        Finds the index of an object in the _lazy_loaded list by comparing the
-        path attribute. Returns None if the object is not in the list.
+        Finds a lazily loaded object in the _lazy_loaded registry using its
+        path attribute. Returns None if the object is not in the registry.
+
+        :param obj: The object (or path) to find
+        :return: The registered lazy object or None if it was not added
+        """
+        path = obj if isinstance(obj, string_types) else obj.path
+        return self._lazy_loaded.get(path)
 
-        :param obj: The object to find
-        :return: The index of the object in the _lazy_loaded list or None if it
-        was not added
+    def lazy_loaded_objects(self):
         """
-        for idx, llobj in enumerate(self._lazy_loaded):
-            if llobj.path == obj.path:
-                return idx
+        Returns the objects that have been read lazily and have not been
+        loaded in full since, in the order they were read.
+
+        :return: List of lazily loaded Neo objects
+        """
+        return list(self._lazy_loaded.values())
+
+    def release_lazy(self, obj=None):
+        """
+        Removes lazily loaded objects from the registry kept by the IO so that
+        they can be garbage collected. Released objects are no longer tracked
+        and will not be recognised when writing the file.
+
+        :param obj: The object (or path) to release. If None, all lazily
+            loaded objects are released.
+        """
+        if obj is None:
+            paths = list(self._lazy_loaded.keys())
         else:
-            return None
+            paths = [obj if isinstance(obj, string_types) else obj.path]
+        released = list(self._lazy_loaded[path] for path in paths
+                        if path in self._lazy_loaded)
+        self._forget_objects(released)
+
+    def _map_object(self, key, neoobj):
+        """
+        Maps the ID of a NIX object to the Neo object read from it. The key is
+        also recorded in a reverse index of the object map, so that the Neo
+        object can be removed from the map without scanning it.
+
+        :param key: ID of the NIX object
+        :param neoobj: The Neo object
+        """
+        previous = self._object_map.get(key)
+        if previous is not None and previous is not neoobj:
+            keys = self._object_keys.get(id(previous))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._object_keys[id(previous)]
+        self._object_map[key] = neoobj
+        self._object_keys.setdefault(id(neoobj), set()).add(key)
+
+    def _forget_objects(self, objects):
+        """
+        Removes Neo objects from the object map and the lazy-object registry
+        of the IO, looking up their keys in the reverse index of the object
+        map and their paths in the registry.
+
+        :param objects: List of Neo objects
+        """
+        for obj in objects:
+            self._lazy_loaded.pop(getattr(obj, "path", None), None)
+            for key in self._object_keys.pop(id(obj), ()):
+                if self._object_map.get(key) is obj:
+                    del self._object_map[key]
 
     @classmethod
     def resolve_name_conflicts(cls, objects):
@@ -928,19 +2837,26 @@ class NixIO(BaseIO):
             if not len(objects):
                 return
             names = [obj.name for obj in objects]
+            # the set of names in use only grows: an object gives up its
+            # name only if another object still holds it, so the first free
+            # suffix of a base name never decreases
+            used = Counter(names)
+            suffixes = dict()
             for idx, cn in enumerate(names):
                 if not cn:
                     cn = cls._generate_name(objects[idx])
                 else:
-                    names[idx] = ""
-                if cn not in names:
+                    used[cn] -= 1
+                if used[cn] <= 0:
                     newname = cn
                 else:
-                    suffix = 1
+                    suffix = suffixes.get(cn, 1)
                     newname = "{}-{}".format(cn, suffix)
-                    while newname in names:
+                    while used[newname] > 0:
                         suffix += 1
                         newname = "{}-{}".format(cn, suffix)
+                    suffixes[cn] = suffix + 1
+                used[newname] += 1
                 names[idx] = newname
             for obj, n in zip(objects, names):
                 obj.name = n
@@ -953,23 +2869,42 @@ class NixIO(BaseIO):
             cls.resolve_name_conflicts(allchildren)
             allchildren = list()
             for seg in block.segments:
-                allchildren.extend(seg.analogsignals +
-                                   seg.irregularlysampledsignals +
-                                   seg.events +
-                                   seg.epochs +
-                                   seg.spiketrains)
+                allchildren.extend(cls._segment_children(seg))
             cls.resolve_name_conflicts(allchildren)
         elif isinstance(objects, Segment):
-            seg = objects
-            cls.resolve_name_conflicts(seg.analogsignals +
-                                       seg.irregularlysampledsignals +
-                                       seg.events +
-                                       seg.epochs +
-                                       seg.spiketrains)
+            cls.resolve_name_conflicts(cls._segment_children(objects))
         elif isinstance(objects, ChannelIndex):
             rcg = objects
             cls.resolve_name_conflicts(rcg.units)
 
+    @staticmethod
+    def _segment_children(seg):
+        return (seg.analogsignals + seg.irregularlysampledsignals +
+                seg.events + seg.epochs + seg.spiketrains)
+
+    @classmethod
+    def _name_scope(cls, obj):
+        """
+        Returns the objects whose names need no further resolution once the
+        names of ``obj`` have been resolved: the names of a Block's Segments
+        and of all the data objects in them are unique within the Block.
+        ChannelIndex objects are not included, since their Units are only
+        resolved when the ChannelIndex itself is.
+
+        :param obj: A Neo object whose names have been resolved
+        :return: List of Neo objects
+        """
+        if isinstance(obj, Block):
+            scope = list(obj.segments)
+            for seg in obj.segments:
+                scope.extend(cls._segment_children(seg))
+            return scope
+        elif isinstance(obj, Segment):
+            return cls._segment_children(obj)
+        elif isinstance(obj, ChannelIndex):
+            return list(obj.units)
+        return []
+
     @staticmethod
     def _generate_name(neoobj):
         neotype = type(neoobj).__name__
@@ -995,7 +2930,7 @@ class NixIO(BaseIO):
     @classmethod
     def _neo_data_to_nix(cls, neoobj):
         attr = dict()
-        attr["data"] = np.transpose(neoobj.magnitude)
+        attr["data"] = neoobj.magnitude
         attr["dataunits"] = cls._get_units(neoobj)
         if isinstance(neoobj, IrregularlySampledSignal):
             attr["times"] = neoobj.times.magnitude
@@ -1017,9 +2952,7 @@ class NixIO(BaseIO):
         if hasattr(neoobj, "labels"):
             attr["labels"] = neoobj.labels.tolist()
         if hasattr(neoobj, "waveforms") and neoobj.waveforms is not None:
-            attr["waveforms"] = list(wf.magnitude for wf in
-                                     list(wfgroup for wfgroup in
-                                          neoobj.waveforms))
+            attr["waveforms"] = neoobj.waveforms.magnitude
             attr["waveformunits"] = cls._get_units(neoobj.waveforms)
         if hasattr(neoobj, "left_sweep") and neoobj.left_sweep is not None:
             attr["left_sweep"] = neoobj.left_sweep.\
@@ -1099,19 +3032,17 @@ class NixIO(BaseIO):
             units = None
         return units
 
-    @staticmethod
-    def _nix_attr_to_neo(nix_obj):
+    def _nix_attr_to_neo(self, nix_obj):
         neo_attrs = dict()
         neo_attrs["name"] = stringify(nix_obj.name)
 
         neo_attrs["description"] = stringify(nix_obj.definition)
-        if nix_obj.metadata:
-            for prop in nix_obj.metadata.props:
-                values = prop.values
-                if len(values) == 1:
-                    neo_attrs[prop.name] = values[0].value
-                else:
-                    neo_attrs[prop.name] = list(v.value for v in values)
+        metadata = nix_obj.metadata
+        if metadata:
+            for name, value in self._get_metadata_props(metadata).items():
+                if isinstance(value, list):
+                    value = list(value)
+                neo_attrs[name] = value
 
         if isinstance(nix_obj, (nixtypes["Block"], nixtypes["Group"])):
             if "rec_datetime" not in neo_attrs:
@@ -1126,31 +3057,94 @@ class NixIO(BaseIO):
         # neo_attrs["file_origin"] = os.path.basename(self.filename)
         return neo_attrs
 
-    @staticmethod
-    def _group_signals(paths):
+    def _prefetch_metadata(self, section):
+        """
+        Reads the properties of a metadata Section and all its subsections in
+        a single traversal and stores their values in the metadata cache, so
+        that converting the objects they belong to does not need to access the
+        file again.
+        Sections that are already cached are not read again.
+
+        :param section: NIX Section (or None)
+        """
+        if section is None or section.id in self._metadata_cache:
+            return
+        sections = [section]
+        while sections:
+            sec = sections.pop()
+            if sec.id not in self._metadata_cache:
+                self._metadata_cache[sec.id] = self._read_metadata_props(sec)
+            sections.extend(sec.sections)
+
+    def _get_metadata_props(self, section):
         """
-        Groups data arrays that were generated by the same Neo Signal object.
+        Returns a dictionary of the property values of a metadata Section.
+        Values are read from the metadata cache or, if the Section has not
+        been prefetched, from the file.
 
-        :param paths: A list of paths (strings) of all the signals to be grouped
-        :return: A list of paths (strings) of signal groups. The last part of
-        each path is the common name of the signals in the group.
+        :param section: NIX Section
+        :return: Dictionary of property names to values
         """
-        grouppaths = list(".".join(p.split(".")[:-1])
-                          for p in paths)
-        # deduplicating paths
-        uniquepaths = []
-        for path in grouppaths:
-            if path not in uniquepaths:
-                uniquepaths.append(path)
-        return uniquepaths
+        if section.id not in self._metadata_cache:
+            self._metadata_cache[section.id] = self._read_metadata_props(
+                section
+            )
+        return self._metadata_cache[section.id]
 
     @staticmethod
-    def _get_referers(nix_obj, obj_list):
-        ref_list = list()
-        for ref in obj_list:
-            if nix_obj.name in list(src.name for src in ref.sources):
-                ref_list.append(ref)
-        return ref_list
+    def _read_metadata_props(section):
+        """
+        Reads the properties of a metadata Section. Properties with a single
+        value are stored as that value and properties with multiple values as
+        a list.
+
+        :param section: NIX Section
+        :return: Dictionary of property names to values
+        """
+        props = dict()
+        for prop in section.props:
+            values = prop.values
+            if len(values) == 1:
+                props[prop.name] = values[0].value
+            else:
+                props[prop.name] = list(v.value for v in values)
+        return props
+
+    def _get_referers(self, nix_obj, nix_block, container):
+        """
+        Returns the objects in the given container ("data_arrays" or
+        "multi_tags") of a NIX Block that reference ``nix_obj`` as a source.
+
+        :param nix_obj: NIX Source
+        :param nix_block: The NIX Block containing the referring objects
+        :param container: Name of the Block container to search
+        :return: List of referring DataArrays or MultiTags
+        """
+        referers = self._get_source_referers(nix_block)[container]
+        return list(referers.get(nix_obj.id, []))
+
+    def _get_source_referers(self, nix_block):
+        """
+        Returns a reverse index of the sources referenced by the DataArrays and
+        MultiTags of a NIX Block, mapping each container name to a dictionary
+        of Source IDs to the objects that reference them.
+        The index is built in a single scan of the Block's DataArrays and
+        MultiTags the first time it is requested and is dropped when new
+        references are created.
+
+        :param nix_block: NIX Block
+        :return: Dictionary of container names to Source ID indices
+        """
+        if nix_block.id in self._source_referers:
+            return self._source_referers[nix_block.id]
+        referers = dict()
+        for container in ("data_arrays", "multi_tags"):
+            index = referers[container] = dict()
+            for ref in getattr(nix_block, container):
+                for src in ref.sources:
+                    index.setdefault(src.id, list()).append(ref)
+        self._source_referers[nix_block.id] = referers
+        return referers
 
     @staticmethod
     def _get_time_dimension(obj):
@@ -1160,23 +3154,100 @@ class NixIO(BaseIO):
         return None
 
     @staticmethod
-    def _hash_object(obj):
+    def _hash_object(obj, hash_factory=None, workers=1):
         """
-        Computes an MD5 hash of a Neo object based on its attribute values and
+        Computes a hash of a Neo object based on its attribute values and
         data objects. Child objects are not counted.
 
+        Values are hashed in the form in which they are stored in the file,
+        so that an object read back from the file has the same hash as the
+        object that was written: dates as timestamps, time attributes of
+        signals and SpikeTrains in seconds (rounded to 12 significant digits,
+        since they are converted between units when they are read), labels
+        and channel names as byte strings, and annotation values without
+        their units or numpy types.
+
+        Arrays are hashed in pieces of at most ``HASH_CHUNK_SIZE`` bytes
+        without copying them as a whole. Arrays that span multiple pieces are
+        hashed piecewise (each piece's digest is added to the object hash), on
+        a pool of ``workers`` threads if more than one worker is given. The
+        result does not depend on the number of workers.
+
         :param obj: A Neo object
-        :return: MD5 sum
+        :param hash_factory: Callable returning a new hashlib-like object
+            (default: ``default_hash_factory``)
+        :param workers: Number of threads used for hashing large arrays
+        :return: Hex digest
         """
-        objhash = md5()
+        hash_factory = hash_factory or default_hash_factory
+        objhash = hash_factory()
 
         def strupdate(a):
             objhash.update(str(a).encode())
 
+        def piecedigest(piece):
+            piecehash = hash_factory()
+            piecehash.update(piece)
+            return piecehash.digest()
+
         def dupdate(d):
-            if isinstance(d, np.ndarray) and not d.flags["C_CONTIGUOUS"]:
-                d = d.copy(order="C")
-            objhash.update(d)
+            d = np.asarray(d)
+            if d.dtype.hasobject:
+                for item in d.flat:
+                    strupdate(item)
+                return
+            strupdate(d.dtype.str)
+            strupdate(d.shape)
+            if d.nbytes <= HASH_CHUNK_SIZE:
+                d = np.ascontiguousarray(d).reshape(-1)
+                objhash.update(d.view(np.uint8))
+                return
+            pieces = array_chunks(d, HASH_CHUNK_SIZE)
+            if workers > 1:
+                pool = ThreadPool(workers)
+                try:
+                    batch = list(islice(pieces, workers))
+                    while batch:
+                        for digest in pool.map(piecedigest, batch):
+                            objhash.update(digest)
+                        batch = list(islice(pieces, workers))
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for piece in pieces:
+                    objhash.update(piecedigest(piece))
+
+        def vupdate(v):
+            if isinstance(v, datetime):
+                v = calculate_timestamp(v)
+            elif isinstance(v, pq.Quantity) and not v.shape:
+                v = v.magnitude.item()
+            elif isinstance(v, np.generic):
+                v = v.item()
+            elif isinstance(v, bytes):
+                v = v.decode()
+            strupdate(v)
+
+        def aupdate(a):
+            if isinstance(a, (list, tuple)):
+                a = np.asarray(a)
+            if isinstance(a, np.ndarray) and a.ndim == 1:
+                a = a.magnitude if isinstance(a, pq.Quantity) else a
+                if a.dtype.kind == "S":
+                    a = np.char.decode(a)
+                dupdate(a)
+            elif isinstance(a, np.ndarray) and a.ndim:
+                dupdate(a)
+            else:
+                vupdate(a)
+
+        def qupdate(q, units=pq.s):
+            strupdate("{:.12g}".format(q.rescale(units).magnitude.item()))
+
+        def lupdate(labels):
+            dupdate(np.array(list(stringify(l).encode() for l in labels),
+                             dtype="S"))
 
         # attributes
         strupdate(obj.name)
@@ -1185,52 +3256,287 @@ class NixIO(BaseIO):
         # annotations
         for k, v in sorted(obj.annotations.items()):
             strupdate(k)
-            strupdate(v)
+            aupdate(v)
 
         # data objects and type-specific attributes
         if isinstance(obj, (Block, Segment)):
-            strupdate(obj.rec_datetime)
-            strupdate(obj.file_datetime)
+            vupdate(obj.rec_datetime)
+            vupdate(obj.file_datetime)
         elif isinstance(obj, ChannelIndex):
-            for idx in obj.index:
-                strupdate(idx)
-            for n in obj.channel_names:
-                strupdate(n)
-            if obj.coordinates is not None:
+            dupdate(obj.index)
+            if obj.channel_names is not None and len(obj.channel_names):
+                lupdate(obj.channel_names)
+            else:
+                # names given to the channels when writing
+                lupdate(list("{}.ChannelIndex{}".format(obj.name, idx)
+                             for idx in range(len(obj.index))))
+            if obj.coordinates is not None and len(obj.coordinates):
+                coordunits = obj.coordinates[0][0].units
                 for coord in obj.coordinates:
                     for c in coord:
-                        strupdate(c)
+                        qupdate(c, coordunits)
         elif isinstance(obj, AnalogSignal):
             dupdate(obj)
-            dupdate(obj.units)
-            dupdate(obj.t_start)
-            dupdate(obj.sampling_rate)
-            dupdate(obj.t_stop)
+            strupdate(obj.dimensionality)
+            qupdate(obj.t_start)
+            qupdate(obj.sampling_period)
         elif isinstance(obj, IrregularlySampledSignal):
             dupdate(obj)
             dupdate(obj.times)
-            dupdate(obj.units)
+            strupdate(obj.dimensionality)
         elif isinstance(obj, Event):
             dupdate(obj.times)
-            for l in obj.labels:
-                strupdate(l)
+            lupdate(obj.labels)
         elif isinstance(obj, Epoch):
             dupdate(obj.times)
             dupdate(obj.durations)
-            for l in obj.labels:
-                strupdate(l)
+            lupdate(obj.labels)
         elif isinstance(obj, SpikeTrain):
             dupdate(obj.times)
-            dupdate(obj.units)
-            dupdate(obj.t_stop)
-            dupdate(obj.t_start)
+            strupdate(obj.dimensionality)
+            qupdate(obj.t_stop)
+            qupdate(obj.t_start)
             if obj.waveforms is not None:
                 dupdate(obj.waveforms)
-            dupdate(obj.sampling_rate)
-            if obj.left_sweep:
-                strupdate(obj.left_sweep)
+                if obj.sampling_rate is not None:
+                    qupdate(obj.sampling_period)
+                if obj.left_sweep is not None:
+                    qupdate(obj.left_sweep)
 
         # type
         strupdate(type(obj).__name__)
 
         return objhash.hexdigest()
+
+
+def _read_block_worker(task):
+    """
+    Reads a single Block in a worker process for ``NixIO.read_all_blocks``.
+    The Block is returned together with the object map, object hashes, and
+    unhashed paths of the worker's NixIO, in a single pickled result so that
+    object identity is preserved between them (see ``_share_result``).
+
+    :param task: Tuple (filename, block path, cascade)
+    :return: Shared tuple (Block, object map, object hashes, unhashed paths)
+    """
+    filename, path, cascade = task
+    io = NixIO(filename, "ro")
+    try:
+        neo_block = io.read_block(path, cascade, False)
+        result = (neo_block, io._object_map, io._object_hashes,
+                  io._unhashed_paths)
+        return _share_result(result)
+    finally:
+        io.nix_file.close()
+
+
+def _share_result(result):
+    """
+    Prepares the result of a worker process for sending to the parent
+    process.
+    If shared memory and pickle protocol 5 are available, the result is
+    pickled with its arrays as out-of-band buffers and each buffer is copied
+    into a shared memory block, so that only the small pickle is sent through
+    the pool and each array is copied once into shared memory and once out
+    of it by the parent (see ``_unshare_result``).
+    Otherwise, the result is returned as is and pickled by the pool, which
+    copies arrays when pickling, sending, and unpickling them.
+
+    :param result: Object to send
+    :return: Tuple (pickled result or result, list of (shared memory name,
+        size) tuples or None)
+    """
+    if shared_memory is None or pickle.HIGHEST_PROTOCOL < 5:
+        return result, None
+    buffers = list()
+    data = pickle.dumps(result, protocol=5, buffer_callback=buffers.append)
+    segments = list()
+    try:
+        for buf in buffers:
+            raw = buf.raw()
+            shm = shared_memory.SharedMemory(create=True,
+                                             size=max(raw.nbytes, 1))
+            segments.append((shm.name, raw.nbytes))
+            shm.buf[:raw.nbytes] = raw
+            shm.close()
+    except Exception:
+        _discard_shared((data, segments))
+        raise
+    return data, segments
+
+
+def _unshare_result(shared):
+    """
+    Restores a result prepared by ``_share_result`` in the parent process.
+    The shared memory blocks are copied into memory owned by the parent,
+    which the restored arrays use directly, and released.
+
+    :param shared: Tuple returned by ``_share_result``
+    :return: The result
+    """
+    data, segments = shared
+    if segments is None:
+        return data
+    buffers = list()
+    try:
+        for name, size in segments:
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                buffers.append(bytearray(shm.buf[:size]))
+            finally:
+                shm.close()
+                shm.unlink()
+    except Exception:
+        _discard_shared((data, segments[len(buffers) + 1:]))
+        raise
+    return pickle.loads(data, buffers=buffers)
+
+
+def _discard_shared(shared):
+    """
+    Releases the shared memory blocks of a result prepared by
+    ``_share_result`` without restoring it.
+
+    :param shared: Tuple returned by ``_share_result``
+    """
+    _, segments = shared
+    for name, _ in segments or ():
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except OSError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+class SignalProxy(object):
+    """
+    Provides access to the data of a lazily loaded AnalogSignal or
+    IrregularlySampledSignal without loading it in full. Indexing the proxy,
+    e.g., ``proxy[1000:2000, 3]``, reads only the requested samples of the
+    requested channels from the file and returns them as a Quantity array.
+
+    The proxy holds references to the DataArrays of the signal and is only
+    valid while the file they belong to is open.
+    """
+
+    def __init__(self, nix_da_group, units, start, stop, timedim, ticks=None,
+                 columns=None):
+        self._nix_da_group = nix_da_group
+        self._columns = columns
+        self._start = start
+        self._stop = stop
+        self._ticks = ticks
+        self.units = pq.Quantity(1, units or "").units
+        self.time_units = pq.Quantity(1, timedim.unit).units
+        if ticks is None:
+            interval = timedim.sampling_interval
+            self.sampling_period = pq.Quantity(interval, timedim.unit)
+            self.t_start = pq.Quantity((timedim.offset or 0) + start * interval,
+                                       timedim.unit)
+        else:
+            self.sampling_period = None
+            self.t_start = None
+
+    @property
+    def shape(self):
+        return (self._stop - self._start,
+                NixIO._signal_channel_count(self._nix_da_group, self._columns))
+
+    @property
+    def dtype(self):
+        return np.result_type(*(da.dtype for da in self._nix_da_group))
+
+    @property
+    def times(self):
+        """
+        The sample times of the signal. For IrregularlySampledSignals, these
+        are read from the file.
+        """
+        if self._ticks is None:
+            return (self.t_start +
+                    np.arange(len(self)) * self.sampling_period)
+        return pq.Quantity(self._ticks[self._start:self._stop],
+                           self.time_units)
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+        if len(index) > 2:
+            raise IndexError("Too many indices for SignalProxy")
+        rows = index[0]
+        cols = index[1] if len(index) == 2 else slice(None)
+        nsamples, nchannels = self.shape
+
+        channels = range(nchannels)
+        if isinstance(cols, (int, np.integer)):
+            chanlist = [channels[cols]]
+        elif isinstance(cols, slice):
+            chanlist = list(channels[cols])
+        else:
+            chanlist = list(channels[c] for c in cols)
+        if NixIO._is_matrix_signal(self._nix_da_group):
+            nix_da_group = self._nix_da_group
+            if self._columns is not None:
+                chanlist = list(self._columns[c] for c in chanlist)
+            columns = chanlist
+        else:
+            nix_da_group = list(self._nix_da_group[c] for c in chanlist)
+            columns = None
+
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(nsamples)
+        else:
+            start = range(nsamples)[rows]
+            stop, step = start + 1, 1
+        if step == 1:
+            stop = max(start, stop)
+            data = NixIO._read_signal_data(nix_da_group, self._start + start,
+                                           self._start + stop, columns)
+        else:
+            sampleidx = np.arange(start, stop, step)
+            if len(sampleidx):
+                first, last = sampleidx.min(), sampleidx.max() + 1
+            else:
+                first = last = 0
+            data = NixIO._read_signal_data(nix_da_group, self._start + first,
+                                           self._start + last, columns)
+            data = data[sampleidx - first]
+
+        if not isinstance(rows, slice):
+            data = data[0]
+        if isinstance(cols, (int, np.integer)):
+            data = data[..., 0]
+        return pq.Quantity(data, self.units, copy=False)
+
+
+class DataArrayProxy(object):
+    """
+    Provides access to the data of a NIX DataArray that belongs to a lazily
+    loaded Epoch, Event, or SpikeTrain (times, durations, or waveforms).
+    Indexing the proxy reads only the requested part of the data from the
+    file and returns it as a Quantity array.
+
+    The proxy is only valid while the file the DataArray belongs to is open.
+    """
+
+    def __init__(self, nix_da):
+        self._nix_da = nix_da
+        self.units = pq.Quantity(1, nix_da.unit or "").units
+
+    @property
+    def shape(self):
+        return tuple(self._nix_da.shape)
+
+    @property
+    def dtype(self):
+        return self._nix_da.dtype
+
+    def __len__(self):
+        return len(self._nix_da)
+
+    def __getitem__(self, index):
+        return pq.Quantity(self._nix_da[index], self.units)
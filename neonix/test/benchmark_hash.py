@@ -0,0 +1,76 @@
+# Copyright (c) 2014, German Neuroinformatics Node (G-Node)
+#                     Achilleas Koutsou <achilleas.k@gmail.com>
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+"""
+Benchmark of the object hashing used for detecting modified objects when
+writing, comparing the hash engine of the NixIO with the previous MD5 based
+implementation.
+
+Run with ``python -m neonix.test.benchmark_hash [megabytes]``.
+"""
+
+from __future__ import print_function
+
+import sys
+from hashlib import md5
+from multiprocessing import cpu_count
+from timeit import default_timer
+
+import numpy as np
+import quantities as pq
+from neo.core import AnalogSignal
+
+from neonix.io.nixio import NixIO
+
+
+def md5_hash(obj):
+    """
+    The hashing of AnalogSignal data as implemented before the hash engine
+    was made configurable: MD5 over a C-ordered copy of the data.
+    """
+    objhash = md5()
+    data = obj
+    if not data.flags["C_CONTIGUOUS"]:
+        data = data.copy(order="C")
+    objhash.update(data)
+    return objhash.hexdigest()
+
+
+def timed(func, *args, **kwargs):
+    start = default_timer()
+    func(*args, **kwargs)
+    return default_timer() - start
+
+
+def run(megabytes=512):
+    nchannels = 64
+    nsamples = megabytes * 2**20 // (8 * nchannels)
+    data = np.random.random((nsamples, nchannels))
+    signals = {
+        "C order": AnalogSignal(data, units=pq.mV, sampling_rate=pq.kHz),
+        "Fortran order": AnalogSignal(np.asfortranarray(data), units=pq.mV,
+                                      sampling_rate=pq.kHz),
+    }
+    print("Hashing {} MiB signals ({} samples x {} channels)".format(
+        megabytes, nsamples, nchannels
+    ))
+    for name, signal in sorted(signals.items()):
+        print(name)
+        print("  md5 (previous):      {:.3f} s".format(
+            timed(md5_hash, signal)
+        ))
+        print("  default, 1 thread:   {:.3f} s".format(
+            timed(NixIO._hash_object, signal, workers=1)
+        ))
+        print("  default, {} threads: {:.3f} s".format(
+            cpu_count(), timed(NixIO._hash_object, signal, workers=cpu_count())
+        ))
+
+
+if __name__ == "__main__":
+    run(*map(int, sys.argv[1:2]))
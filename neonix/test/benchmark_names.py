@@ -0,0 +1,86 @@
+# Copyright (c) 2014, German Neuroinformatics Node (G-Node)
+#                     Achilleas Koutsou <achilleas.k@gmail.com>
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+"""
+Benchmark of the resolution of object names for containers with many
+unnamed objects, comparing the NixIO with the previous list based
+implementation.
+
+Run with ``python -m neonix.test.benchmark_names [objects]``.
+"""
+
+from __future__ import print_function
+
+import sys
+from timeit import default_timer
+
+from neonix.io.nixio import NixIO
+
+
+class SpikeTrain(object):
+    """
+    Stand-in for a Neo SpikeTrain: only the name and the type are used when
+    resolving names.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+
+
+def list_resolve(objects):
+    """
+    The resolution of names in a list of objects as implemented before
+    names were counted.
+    """
+    names = [obj.name for obj in objects]
+    for idx, cn in enumerate(names):
+        if not cn:
+            cn = NixIO._generate_name(objects[idx])
+        else:
+            names[idx] = ""
+        if cn not in names:
+            newname = cn
+        else:
+            suffix = 1
+            newname = "{}-{}".format(cn, suffix)
+            while newname in names:
+                suffix += 1
+                newname = "{}-{}".format(cn, suffix)
+        names[idx] = newname
+    for obj, n in zip(objects, names):
+        obj.name = n
+
+
+def timed(func, objects):
+    start = default_timer()
+    func(objects)
+    return default_timer() - start
+
+
+def run(nobjects=100000):
+    objects = [SpikeTrain() for _ in range(nobjects)]
+    print("Resolving names of {} unnamed objects".format(nobjects))
+    print("  NixIO:            {:.3f} s".format(
+        timed(NixIO.resolve_name_conflicts, objects)
+    ))
+    print("  again (resolved): {:.3f} s".format(
+        timed(NixIO.resolve_name_conflicts, objects)
+    ))
+    # the list based implementation is cubic; time it on a fraction
+    nprevious = min(nobjects, 2000)
+    previous = [SpikeTrain() for _ in range(nprevious)]
+    expected = [SpikeTrain() for _ in range(nprevious)]
+    print("  list (previous), {} objects: {:.3f} s".format(
+        nprevious, timed(list_resolve, previous)
+    ))
+    NixIO.resolve_name_conflicts(expected)
+    assert [o.name for o in previous] == [o.name for o in expected]
+
+
+if __name__ == "__main__":
+    run(*map(int, sys.argv[1:2]))
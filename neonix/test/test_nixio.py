@@ -28,7 +28,8 @@ from neo.core import (Block, Segment, ChannelIndex, AnalogSignal,
 from neo.test.iotest.common_io_test import BaseTestIO
 
 from neonix.io.nixio import NixIO
-from neonix.io.nixio import nixtypes
+from neonix.io.nixio import nixtypes, h5dataset
+from neonix.io.nixio import STORAGE_PROFILES, MAX_CHUNK_SIZE
 
 
 class NixIOTest(unittest.TestCase):
@@ -166,8 +167,9 @@ class NixIOTest(unittest.TestCase):
         nixmd = nixdalist[0].metadata
         self.assertTrue(all(nixmd == da.metadata for da in nixdalist))
         neounit = str(neosig.dimensionality)
-        for sig, da in zip(np.transpose(neosig),
-                           sorted(nixdalist, key=lambda d: d.name)):
+        nixdalist = sorted(nixdalist,
+                           key=lambda d: int(d.name.split(".")[-1]))
+        for sig, da in zip(np.transpose(neosig), nixdalist):
             self.compare_attr(neosig, da)
             np.testing.assert_almost_equal(sig.magnitude, da)
             self.assertEqual(neounit, da.unit)
@@ -768,6 +770,19 @@ class NixIOWriteTest(NixIOTest):
                                               units=pq.s))
         self.io.write_block(block)
 
+    def test_name_conflict_order(self):
+        """
+        Names are resolved in list order, taking the first suffix not in use
+        by any other object.
+        """
+        times = self.rquant(1, pq.s)
+        names = ["a", "a", "a-1", None, None, "neo.Event-1"]
+        events = [Event(name=name, times=times) for name in names]
+        NixIO.resolve_name_conflicts(events)
+        self.assertEqual([ev.name for ev in events],
+                         ["a-2", "a", "a-1",
+                          "neo.Event", "neo.Event-2", "neo.Event-1"])
+
     def test_annotations_write(self):
         """
         Write full data tree: Annotations only
@@ -869,6 +884,801 @@ class NixIOWriteTest(NixIOTest):
         np.testing.assert_almost_equal(nix_wf, wf_array.magnitude)
         self.compare_blocks([blk], [nix_block])
 
+    def test_waveforms_without_left_sweep(self):
+        blk = Block(name="wfblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        times = self.rquant(10, pq.s, incr=True)
+        spkt = SpikeTrain(times, waveforms=self.rquant((10, 2, 5), pq.mV),
+                          name="spkt", t_stop=times[-1],
+                          sampling_period=pq.ms)
+        seg.spiketrains.append(spkt)
+        self.io.write_block(blk)
+
+        stpath = "/wfblk/segments/seg/spiketrains/spkt"
+        nix_wf = self.io.nix_file.blocks["wfblk"].multi_tags["spkt"].\
+            features[0].data
+        self.assertNotIn("left_sweep", nix_wf.metadata)
+        for lazy in (False, True):
+            self.assertIsNone(self.io.read_spiketrain(stpath,
+                                                      lazy=lazy).left_sweep)
+        # waveforms without any metadata
+        del nix_wf.metadata
+        for lazy in (False, True):
+            self.assertIsNone(self.io.read_spiketrain(stpath,
+                                                      lazy=lazy).left_sweep)
+
+    def test_path_cache_write(self):
+        blk = Block(name="pcblk")
+        seg = Segment(name="pcseg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((10, 2), pq.mV),
+                            sampling_rate=pq.kHz, name="pcsig")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+
+        nix_block = self.io.nix_file.blocks["pcblk"]
+        segpath = "/pcblk/segments/pcseg"
+        self.assertEqual(self.io._path_map["/pcblk"], nix_block)
+        self.assertEqual(self.io._path_map[segpath], nix_block.groups[0])
+        sigpath = segpath + "/analogsignals/pcsig"
+        self.assertEqual(len(self.io._path_map[sigpath]), 2)
+
+    def test_stored_hash_write(self):
+        blk = Block(name="hashblk")
+        for idx in range(2):
+            seg = Segment(name="seg{}".format(idx))
+            seg.analogsignals.append(
+                AnalogSignal(signal=self.rquant((10, 2), pq.mV),
+                             sampling_rate=pq.kHz, name="sig{}".format(idx))
+            )
+            blk.segments.append(seg)
+        self.io.write_block(blk)
+        nix_block = self.io.nix_file.blocks["hashblk"]
+        self.assertEqual(self.io._get_stored_hash(nix_block),
+                         self.io._object_hashes["/hashblk"])
+        self.io.nix_file.close()
+
+        self.io = NixIO(self.filename, "rw")
+        neo_block = self.io.read_block("/hashblk")
+        neo_block.segments[1].description = "modified"
+        self.io._hash_stored_object = mock.Mock()
+        self.io._write_attr_annotations = mock.Mock()
+        self.io.write_block(neo_block)
+        self.io._hash_stored_object.assert_not_called()
+        self.assertEqual(self.io._write_attr_annotations.call_count, 1)
+        nixobj = self.io._write_attr_annotations.call_args[0][0]
+        self.assertEqual(nixobj.name, "seg1")
+        self.assertEqual(
+            self.io._get_stored_hash(nixobj),
+            self.io._object_hashes["/hashblk/segments/seg1"]
+        )
+
+    def test_stored_hash_reread(self):
+        blk = Block(name="rereadblk",
+                    rec_datetime=datetime(2015, 3, 4, 12, 30, 15),
+                    file_datetime=datetime(2016, 5, 6, 7, 8, 9, 123456))
+        seg = Segment(name="seg", rec_datetime=datetime(2015, 3, 4, 13))
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 2), pq.mV),
+                            sampling_rate=30000*pq.Hz, t_start=150*pq.ms,
+                            name="asig")
+        times = self.rquant(10, pq.ms, True)
+        st = SpikeTrain(times=times, t_stop=times[-1], name="st",
+                        waveforms=self.rquant((10, 2, 5), pq.mV),
+                        sampling_rate=20000*pq.Hz, left_sweep=0.1*pq.ms)
+        ep = Epoch(times=times, durations=self.rquant(10, pq.ms),
+                   labels=np.array(["ep"] * 10), name="ep")
+        seg.analogsignals.append(asig)
+        seg.spiketrains.append(st)
+        seg.epochs.append(ep)
+        chx = ChannelIndex(name="chx", index=[0, 1])
+        chx.analogsignals.append(asig)
+        blk.channel_indexes.append(chx)
+        self.io.write_block(blk)
+        self.io.nix_file.close()
+
+        # objects read back from the file match the stored hashes
+        self.io = NixIO(self.filename, "rw")
+        neo_block = self.io.read_block("/rereadblk")
+        self.io._hash_stored_object = mock.Mock()
+        self.io._write_attr_annotations = mock.Mock()
+        self.io.write_block(neo_block)
+        self.io._hash_stored_object.assert_not_called()
+        self.io._write_attr_annotations.assert_not_called()
+
+    def test_new_object_collision_write(self):
+        blk = Block(name="storedblk")
+        seg = Segment(name="seg")
+        seg.analogsignals.append(
+            AnalogSignal(signal=self.rquant((10, 2), pq.mV),
+                         sampling_rate=pq.kHz, name="sig")
+        )
+        blk.segments.append(seg)
+        self.io.write_block(blk)
+        self.io.nix_file.close()
+
+        self.io = NixIO(self.filename, "rw")
+        newblk = Block(name="storedblk")
+        with self.assertRaises(nixio.exceptions.DuplicateName):
+            self.io.write_block(newblk)
+        neo_block = self.io.read_block("/storedblk")
+        newseg = Segment(name="seg")
+        with self.assertRaises(nixio.exceptions.DuplicateName):
+            self.io.write_segment(newseg, "/storedblk")
+        np.testing.assert_almost_equal(
+            neo_block.segments[0].analogsignals[0].magnitude,
+            seg.analogsignals[0].magnitude
+        )
+        # objects read from the file are still written in place
+        neo_block.segments[0].description = "modified"
+        self.io.write_block(neo_block)
+        nix_group = self.io.nix_file.blocks["storedblk"].groups["seg"]
+        self.assertEqual(nix_group.definition, "modified")
+
+    def test_rewritten_annotation_read(self):
+        blk = Block(name="annblk")
+        seg = Segment(name="seg")
+        seg.annotate(label="raw")
+        blk.segments.append(seg)
+        self.io.write_block(blk)
+        nix_group = self.io.nix_file.blocks["annblk"].groups["seg"]
+        # without a stored hash, the segment is hashed from the file
+        del nix_group._h5group.group.attrs["neo.hash"]
+        self.io.nix_file.close()
+
+        self.io = NixIO(self.filename, "rw")
+        neo_block = self.io.read_block("/annblk")
+        neo_block.segments[0].annotate(label="curated")
+        self.io.write_block(neo_block)
+        nix_group = self.io.nix_file.blocks["annblk"].groups["seg"]
+        self.assertEqual(nix_group.metadata["label"], "curated")
+        neo_attrs = self.io._nix_attr_to_neo(nix_group)
+        self.assertEqual(neo_attrs["label"], "curated")
+
+    def test_change_detection_write(self):
+        self.io.nix_file.close()
+        with self.assertRaises(ValueError):
+            NixIO(self.filename, "rw", change_detection="unknown")
+        self.io = NixIO(self.filename, "ow", change_detection="snapshot")
+        blk = Block(name="dirtyblk")
+        for idx in range(2):
+            seg = Segment(name="seg{}".format(idx))
+            seg.analogsignals.append(
+                AnalogSignal(signal=self.rquant((10, 2), pq.mV),
+                             sampling_rate=pq.kHz, name="sig{}".format(idx))
+            )
+            blk.segments.append(seg)
+        self.io.write_block(blk)
+
+        hash_object = self.io._hash_object
+        self.io._hash_object = mock.Mock(wraps=hash_object)
+        blk.segments[1].annotate(label="curated")
+        self.io.write_block(blk)
+        self.assertEqual(self.io._hash_object.call_count, 1)
+        self.assertIs(self.io._hash_object.call_args[0][0], blk.segments[1])
+        nix_group = self.io.nix_file.blocks["dirtyblk"].groups["seg1"]
+        self.assertEqual(nix_group.metadata["label"], "curated")
+
+        asig = blk.segments[0].analogsignals[0]
+        asig[:] = self.rquant((10, 2), pq.mV)
+        self.io._hash_object.reset_mock()
+        self.io.write_block(blk)
+        self.io._hash_object.assert_not_called()
+        self.io.mark_modified(asig)
+        self.io.write_block(blk)
+        self.assertEqual(self.io._hash_object.call_count, 1)
+        neo_sig = self.io.read_analogsignal(
+            "/dirtyblk/segments/seg0/analogsignals/sig0"
+        )
+        np.testing.assert_almost_equal(neo_sig.magnitude, asig.magnitude)
+
+    def test_append_analogsignal(self):
+        blk = Block(name="appendblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 3), pq.mV),
+                            sampling_rate=pq.kHz, t_start=1*pq.s,
+                            name="asig")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+
+        sigpath = "/appendblk/segments/seg/analogsignals/asig"
+        new_samples = self.rquant((50, 3), pq.V)
+        self.io.append_analogsignal(sigpath, new_samples)
+        self.assertNotIn(sigpath, self.io._object_hashes)
+        neo_signal = self.io.read_analogsignal(sigpath)
+        self.assertEqual(neo_signal.shape, (150, 3))
+        np.testing.assert_almost_equal(neo_signal.magnitude[:100],
+                                       asig.magnitude)
+        np.testing.assert_almost_equal(neo_signal.magnitude[100:],
+                                       new_samples.rescale(pq.mV).magnitude)
+        self.assertEqual(neo_signal.t_start, asig.t_start)
+
+        with self.assertRaises(ValueError):
+            self.io.append_analogsignal(sigpath, self.rquant((50, 2), pq.mV))
+
+    def test_append_eest(self):
+        blk = Block(name="appendblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        times = self.rquant(10, pq.s, True)
+        st = SpikeTrain(times=times, t_stop=times[-1], name="st",
+                        waveforms=self.rquant((10, 2, 5), pq.mV),
+                        sampling_period=pq.ms, left_sweep=1*pq.ms)
+        ev = Event(times=times, labels=np.array(["ev"] * 10, dtype="S"),
+                   name="ev")
+        ep = Epoch(times=times, durations=self.rquant(10, pq.s),
+                   labels=np.array(["ep"] * 10, dtype="S"), name="ep")
+        seg.spiketrains.append(st)
+        seg.events.append(ev)
+        seg.epochs.append(ep)
+        self.io.write_block(blk)
+
+        segpath = "/appendblk/segments/seg"
+        new_times = times[-1] + self.rquant(5, pq.ms, True)
+        new_wfs = self.rquant((5, 2, 5), pq.V)
+        self.io.append_spiketrain(segpath + "/spiketrains/st", new_times,
+                                  waveforms=new_wfs)
+        neo_st = self.io.read_spiketrain(segpath + "/spiketrains/st")
+        np.testing.assert_almost_equal(neo_st.times.magnitude[10:],
+                                       new_times.rescale(pq.s).magnitude)
+        np.testing.assert_almost_equal(neo_st.waveforms.magnitude[10:],
+                                       new_wfs.rescale(pq.mV).magnitude)
+        self.assertAlmostEqual(neo_st.t_stop, new_times[-1])
+        with self.assertRaises(ValueError):
+            self.io.append_spiketrain(segpath + "/spiketrains/st", new_times)
+
+        self.io.append_event(segpath + "/events/ev", new_times,
+                             labels=["new"] * 5)
+        neo_ev = self.io.read_event(segpath + "/events/ev")
+        self.assertEqual(len(neo_ev), 15)
+        self.assertEqual(list(neo_ev.labels[10:]), [b"new"] * 5)
+
+        new_durations = self.rquant(5, pq.ms)
+        self.io.append_epoch(segpath + "/epochs/ep", new_times, new_durations)
+        neo_ep = self.io.read_epoch(segpath + "/epochs/ep")
+        self.assertEqual(len(neo_ep), 15)
+        self.assertEqual(len(neo_ep.labels), 15)
+        np.testing.assert_almost_equal(
+            neo_ep.durations.magnitude[10:],
+            new_durations.rescale(neo_ep.durations.units).magnitude
+        )
+
+    def test_overwrite_modified(self):
+        blk = Block(name="curatedblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 3), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        times = self.rquant(10, pq.s, True)
+        ep = Epoch(times=times, durations=self.rquant(10, pq.s),
+                   labels=np.array(["ep"] * 10, dtype="S"), name="ep")
+        st = SpikeTrain(times=times, t_stop=times[-1], name="st",
+                        waveforms=self.rquant((10, 2, 5), pq.mV),
+                        sampling_period=pq.ms)
+        seg.analogsignals.append(asig)
+        seg.epochs.append(ep)
+        seg.spiketrains.append(st)
+        self.io.write_block(blk)
+
+        nix_block = self.io.nix_file.blocks["curatedblk"]
+        daids = dict((da.name, da.id) for da in nix_block.data_arrays)
+        asig[:] = self.rquant((100, 3), pq.mV)
+        ep.labels = np.array(["relabeled"] * 10, dtype="S")
+        ep.durations = ep.durations * 2
+        st.waveforms = st.waveforms * 2
+        self.io.write_block(blk)
+
+        self.assertEqual(
+            daids, dict((da.name, da.id) for da in nix_block.data_arrays)
+        )
+        for da in nix_block.data_arrays:
+            if da.type == "neo.analogsignal":
+                self.assertEqual(len(da.dimensions), 2)
+        mtag = nix_block.multi_tags["ep"]
+        self.assertEqual(len(mtag.positions.dimensions), 1)
+        self.assertEqual(len(nix_block.data_arrays["st.waveforms"].dimensions),
+                         3)
+        neo_seg = self.io.read_block("/curatedblk").segments[0]
+        np.testing.assert_almost_equal(neo_seg.analogsignals[0].magnitude,
+                                       asig.magnitude)
+        self.assertEqual(list(neo_seg.epochs[0].labels), list(ep.labels))
+        np.testing.assert_almost_equal(neo_seg.epochs[0].durations.magnitude,
+                                       ep.durations.magnitude)
+        np.testing.assert_almost_equal(
+            neo_seg.spiketrains[0].waveforms.magnitude, st.waveforms.magnitude
+        )
+
+        longsig = AnalogSignal(signal=self.rquant((150, 2), pq.mV),
+                               sampling_rate=pq.kHz, name="asig")
+        seg.analogsignals[0] = longsig
+        self.io.write_block(blk)
+        self.assertNotIn("asig.2", nix_block.data_arrays)
+        self.assertEqual(nix_block.data_arrays["asig.0"].id, daids["asig.0"])
+        neo_seg = self.io.read_block("/curatedblk").segments[0]
+        np.testing.assert_almost_equal(neo_seg.analogsignals[0].magnitude,
+                                       longsig.magnitude)
+
+    def test_matrix_layout_write(self):
+        self.io.nix_file.close()
+        self.io = NixIO(self.filename, "ow", signal_layout="2d")
+        blk = Block(name="matrixblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 4), pq.mV),
+                            sampling_rate=pq.kHz, t_start=1*pq.s,
+                            name="asig")
+        isig = IrregularlySampledSignal(times=self.rquant(50, pq.s, True),
+                                        signal=self.rquant((50, 3), pq.mV),
+                                        name="isig")
+        chansig = AnalogSignal(signal=self.rquant((10, 2), pq.mV),
+                               sampling_rate=pq.kHz, name="chansig.1")
+        seg.analogsignals.extend([asig, chansig])
+        seg.irregularlysampledsignals.append(isig)
+        self.io.write_block(blk)
+
+        nix_block = self.io.nix_file.blocks["matrixblk"]
+        self.assertEqual(nix_block.data_arrays["asig"].shape, (100, 4))
+        self.assertEqual(nix_block.data_arrays["isig"].shape, (50, 3))
+        self.assertIn("chansig.1.0", nix_block.data_arrays)
+
+        neo_block = self.io.read_block("/matrixblk")
+        neo_seg = neo_block.segments[0]
+        signals = dict((s.name, s) for s in neo_seg.analogsignals +
+                       neo_seg.irregularlysampledsignals)
+        for sig in (asig, isig, chansig):
+            np.testing.assert_almost_equal(signals[sig.name].magnitude,
+                                           sig.magnitude)
+        self.assertEqual(signals["asig"].t_start, asig.t_start)
+        np.testing.assert_almost_equal(signals["isig"].times.magnitude,
+                                       isig.times.magnitude)
+
+        sigpath = "/matrixblk/segments/seg/analogsignals/asig"
+        subset = self.io.read_analogsignal(sigpath, channels=[3, 1])
+        np.testing.assert_almost_equal(subset.magnitude,
+                                       asig.magnitude[:, [3, 1]])
+        lazysig = self.io.read_analogsignal(sigpath, lazy=True, channels=[3, 1])
+        self.assertEqual(lazysig.lazy_shape, (100, 2))
+        np.testing.assert_almost_equal(lazysig.proxy[10:20, 0].magnitude,
+                                       asig.magnitude[10:20, 3])
+
+        self.io.append_analogsignal(sigpath, self.rquant((20, 4), pq.mV))
+        self.assertEqual(self.io.read_analogsignal(sigpath).shape, (120, 4))
+
+    def test_storage_profile_write(self):
+        self.io.nix_file.close()
+        with self.assertRaises(ValueError):
+            NixIO(self.filename, "ow", storage_profile="unknown")
+        self.io = NixIO(self.filename, "ow", storage_profile="archive")
+        blk = Block(name="profileblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 2), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        times = self.rquant(10, pq.s, True)
+        st = SpikeTrain(times=times, t_stop=times[-1], name="st",
+                        waveforms=self.rquant((10, 2, 5), pq.mV),
+                        sampling_period=pq.ms)
+        seg.analogsignals.append(asig)
+        seg.spiketrains.append(st)
+        self.io.write_block(blk)
+
+        nix_block = self.io.nix_file.blocks["profileblk"]
+        profile = self.io._storage_profile
+        for daname, kind in (("asig.0", "signal"), ("st.times", "times"),
+                             ("st.waveforms", "waveforms")):
+            dset = h5dataset(nix_block.data_arrays[daname])
+            self.assertEqual(dset.compression, "gzip")
+            self.assertTrue(dset.shuffle)
+            self.assertTrue(dset.fletcher32)
+            self.assertEqual(dset.chunks[0], profile[kind]["chunks"])
+            self.assertIsNone(dset.maxshape[0])
+
+        neo_block = self.io.read_block("/profileblk")
+        neo_seg = neo_block.segments[0]
+        np.testing.assert_almost_equal(neo_seg.analogsignals[0].magnitude,
+                                       asig.magnitude)
+        np.testing.assert_almost_equal(neo_seg.spiketrains[0].magnitude,
+                                       st.magnitude)
+        np.testing.assert_almost_equal(
+            neo_seg.spiketrains[0].waveforms.magnitude, st.waveforms.magnitude
+        )
+
+    def test_partial_signal_write(self):
+        blk = Block(name="partialblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 4), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+
+        sigpath = "/partialblk/segments/seg/analogsignals/asig"
+        expected = asig.magnitude.copy()
+        subset = self.io.read_analogsignal(sigpath, channels=[3, 1])
+        subset[:] = self.rquant(subset.shape, pq.mV)
+        expected[:, [3, 1]] = subset.magnitude
+        self.io.write_analogsignal(subset, "/partialblk/segments/seg")
+        nix_block = self.io.nix_file.blocks["partialblk"]
+        self.assertEqual(len(nix_block.groups["seg"].data_arrays), 4)
+        neo_block = self.io.read_block("/partialblk")
+        np.testing.assert_almost_equal(
+            neo_block.segments[0].analogsignals[0].magnitude, expected
+        )
+
+        # time windows of a block read with a channel subset
+        neo_block = self.io.read_block("/partialblk", channels=[2])
+        window = self.io.read_analogsignal(sigpath, t_start=50*pq.ms,
+                                           t_stop=80*pq.ms, channels=[0])
+        window[:] = self.rquant(window.shape, pq.mV)
+        first = int(round(window.t_start.rescale(pq.ms).magnitude.item()))
+        expected[first:first + len(window), [0]] = window.magnitude
+        neo_block.segments[0].analogsignals[0][:] = 0 * pq.mV
+        expected[:, 2] = 0
+        self.io.write_analogsignal(window, "/partialblk/segments/seg")
+        self.io.write_block(neo_block)
+        neo_signal = self.io.read_analogsignal(sigpath)
+        np.testing.assert_almost_equal(neo_signal.magnitude, expected)
+
+    def test_partial_channelindex_write(self):
+        blk = Block(name="partialchx")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((50, 4), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        seg.analogsignals.append(asig)
+        chx = ChannelIndex(name="tetrode", index=[0, 1, 2, 3],
+                           channel_names=["c0", "c1", "c2", "c3"])
+        chx.analogsignals.append(asig)
+        blk.channel_indexes.append(chx)
+        self.io.write_block(blk)
+        self.io.nix_file.close()
+
+        self.io = NixIO(self.filename, "rw")
+        neo_block = self.io.read_block("/partialchx", channels=["c1", "c3"])
+        subset = neo_block.segments[0].analogsignals[0]
+        self.assertIs(neo_block.channel_indexes[0].analogsignals[0], subset)
+        subset[:] = self.rquant(subset.shape, pq.mV)
+        expected = asig.magnitude.copy()
+        expected[:, [1, 3]] = subset.magnitude
+        self.io.write_block(neo_block)
+
+        sigpath = "/partialchx/segments/seg/analogsignals/asig"
+        neo_signal = self.io.read_analogsignal(sigpath)
+        np.testing.assert_almost_equal(neo_signal.magnitude, expected)
+        nix_block = self.io.nix_file.blocks["partialchx"]
+        for idx in range(4):
+            da = nix_block.data_arrays["asig.{}".format(idx)]
+            self.assertEqual([src.name for src in da.sources], ["tetrode"])
+
+    def test_storage_profile_matrix_write(self):
+        self.io.nix_file.close()
+        self.io = NixIO(self.filename, "ow", signal_layout="2d",
+                        storage_profile="fast-read")
+        blk = Block(name="wideblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 384), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+
+        dset = h5dataset(self.io.nix_file.blocks["wideblk"].data_arrays["asig"])
+        self.assertLessEqual(dset.dtype.itemsize * np.prod(dset.chunks),
+                             MAX_CHUNK_SIZE)
+        self.assertEqual(
+            NixIO._chunk_shape((100,), np.float64,
+                               STORAGE_PROFILES["fast-read"]["signal"]),
+            (STORAGE_PROFILES["fast-read"]["signal"]["chunks"],)
+        )
+        neo_block = self.io.read_block("/wideblk")
+        np.testing.assert_almost_equal(
+            neo_block.segments[0].analogsignals[0].magnitude, asig.magnitude
+        )
+
+    def test_noncontiguous_write(self):
+        blk = Block(name="layoutblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        data = self.rquant((20, 6), pq.mV)
+        fsig = AnalogSignal(signal=np.asfortranarray(data), units=pq.mV,
+                            sampling_rate=pq.kHz, name="fsig")
+        vsig = AnalogSignal(signal=data[::2, 1::2], units=pq.mV,
+                            sampling_rate=pq.kHz, name="vsig")
+        seg.analogsignals.extend([fsig, vsig])
+        write_array = NixIO._write_array
+        with mock.patch.object(NixIO, "_write_array",
+                               wraps=write_array) as spy:
+            self.io.write_block(blk)
+        # signal data is written from the original arrays, without copies
+        written = list(c[0][1] for c in spy.call_args_list)
+        self.assertEqual(len(written), 9)
+        for arr in written:
+            self.assertTrue(np.shares_memory(arr, fsig.magnitude) or
+                            np.shares_memory(arr, vsig.magnitude))
+
+        nix_block = self.io.nix_file.blocks["layoutblk"]
+        for idx in range(6):
+            np.testing.assert_almost_equal(
+                nix_block.data_arrays["fsig.{}".format(idx)][:],
+                data.magnitude[:, idx]
+            )
+        for idx in range(3):
+            np.testing.assert_almost_equal(
+                nix_block.data_arrays["vsig.{}".format(idx)][:],
+                data.magnitude[::2, 1 + 2 * idx]
+            )
+
+    def test_compact(self):
+        blk = Block(name="compactblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((1000, 4), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        times = self.rquant(10, pq.s, True)
+        st = SpikeTrain(times=times, t_stop=times[-1], name="st",
+                        waveforms=self.rquant((10, 2, 5), pq.mV),
+                        sampling_period=pq.ms)
+        seg.analogsignals.append(asig)
+        seg.spiketrains.append(st)
+        self.io.write_block(blk)
+        nix_block = self.io.nix_file.blocks["compactblk"]
+        nix_block.create_data_array("scratch", "scratch",
+                                    data=np.zeros(100000))
+        self.io.nix_file.close()
+        self.io._reopen_file()
+        del self.io.nix_file.blocks["compactblk"].data_arrays["scratch"]
+
+        self.assertGreater(self.io.compact(), 0)
+        copyname = "nixio_testfile_compact.h5"
+        self.io.compact(copyname, storage_profile="archive")
+        try:
+            for io in (self.io, NixIO(copyname, "ro")):
+                neo_seg = io.read_block("/compactblk").segments[0]
+                np.testing.assert_almost_equal(
+                    neo_seg.analogsignals[0].magnitude, asig.magnitude
+                )
+                np.testing.assert_almost_equal(
+                    neo_seg.spiketrains[0].waveforms.magnitude,
+                    st.waveforms.magnitude
+                )
+            nix_block = io.nix_file.blocks["compactblk"]
+            dset = h5dataset(nix_block.data_arrays["asig.0"])
+            self.assertEqual(dset.compression, "gzip")
+            with self.assertRaises(ValueError):
+                io.compact()
+            io.nix_file.close()
+        finally:
+            os.remove(copyname)
+
+    def test_compact_write(self):
+        blk = Block(name="compactwrite")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 3), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+        self.io.nix_file.close()
+
+        self.io = NixIO(self.filename, "rw")
+        neo_block = self.io.read_block("/compactwrite")
+        sigpath = "/compactwrite/segments/seg/analogsignals/asig"
+        subset = self.io.read_analogsignal(sigpath, channels=[2])
+        nix_file = self.io.nix_file
+        copyname = "nixio_testfile_compactwrite.h5"
+        try:
+            self.io.compact(copyname)
+        finally:
+            os.remove(copyname)
+        self.assertIs(self.io.nix_file, nix_file)
+
+        self.io.compact()
+        neo_sig = neo_block.segments[0].analogsignals[0]
+        neo_sig[:] = self.rquant((100, 3), pq.mV)
+        neo_block.segments[0].description = "compacted"
+        self.io.write_block(neo_block)
+
+        # written objects are still recognised after compacting again
+        self.io.compact()
+        neo_block.segments[0].description = "compacted again"
+        self.io.write_block(neo_block)
+        nix_group = self.io.nix_file.blocks["compactwrite"].groups["seg"]
+        self.assertEqual(nix_group.definition, "compacted again")
+        subset[:] = self.rquant((100, 1), pq.mV)
+        self.io.write_analogsignal(subset, "/compactwrite/segments/seg")
+        expected = neo_sig.magnitude.copy()
+        expected[:, 2:] = subset.magnitude
+        np.testing.assert_almost_equal(
+            self.io.read_analogsignal(sigpath).magnitude, expected
+        )
+
+    def test_reference_links_write(self):
+        blk = Block(name="refblk")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        chx = ChannelIndex(name="chx", index=[0, 1])
+        blk.channel_indexes.append(chx)
+        asig = AnalogSignal(signal=self.rquant((10, 2), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        seg.analogsignals.append(asig)
+        chx.analogsignals.append(asig)
+        ev = Event(times=self.rquant(5, pq.s, True), name="ev",
+                   labels=np.array(["ev"] * 5, dtype="S"))
+        seg.events.append(ev)
+        for idx in range(3):
+            unit = Unit(name="unit{}".format(idx))
+            chx.units.append(unit)
+            times = self.rquant(10, pq.s, True)
+            st = SpikeTrain(times=times, t_stop=times[-1],
+                            name="st{}".format(idx))
+            seg.spiketrains.append(st)
+            unit.spiketrains.append(st)
+        self.io.write_block(blk)
+        self.io._create_references(blk)
+
+        nix_block = self.io.nix_file.blocks["refblk"]
+        nix_chx = nix_block.sources["chx"]
+        for da in nix_block.data_arrays:
+            if da.type == "neo.analogsignal":
+                self.assertEqual(list(s.id for s in da.sources), [nix_chx.id])
+        nix_ev = nix_block.multi_tags["ev"]
+        self.assertEqual(len(nix_ev.references), 2)
+        for idx in range(3):
+            nix_st = nix_block.multi_tags["st{}".format(idx)]
+            nix_unit = nix_chx.sources["unit{}".format(idx)]
+            self.assertEqual(list(s.id for s in nix_st.sources),
+                             [nix_chx.id, nix_unit.id])
+
+    def test_signal_channel_order(self):
+        blk = Block(name="chanorder")
+        seg = Segment()
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((10, 12), pq.mV),
+                            sampling_rate=pq.kHz, name="twelve")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+
+        neo_block = self.io.read_block("/chanorder")
+        neo_asig = neo_block.segments[0].analogsignals[0]
+        np.testing.assert_almost_equal(neo_asig.magnitude, asig.magnitude)
+        self.compare_blocks([blk], [self.io.nix_file.blocks["chanorder"]])
+
+    def test_time_window_read(self):
+        blk = Block(name="windows")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((1000, 3), pq.mV),
+                            sampling_rate=pq.kHz, t_start=2*pq.s,
+                            name="asig")
+        isig = IrregularlySampledSignal(times=self.rquant(500, pq.s, True),
+                                        signal=self.rquant((500, 2), pq.mV),
+                                        name="isig")
+        seg.analogsignals.append(asig)
+        seg.irregularlysampledsignals.append(isig)
+        self.io.write_block(blk)
+
+        segpath = "/windows/segments/seg"
+        t_start, t_stop = 2200*pq.ms, 2.5*pq.s
+        window = self.io.read_analogsignal(segpath + "/analogsignals/asig",
+                                           t_start=t_start, t_stop=t_stop)
+        expected = asig.time_slice(t_start, t_stop)
+        self.assertEqual(window.shape, (300, 3))
+        np.testing.assert_almost_equal(window.magnitude, expected.magnitude)
+        self.assertAlmostEqual(window.t_start, expected.t_start)
+
+        window = self.io.read_analogsignal(segpath + "/analogsignals/asig",
+                                           t_stop=2100*pq.ms)
+        np.testing.assert_almost_equal(window.magnitude,
+                                       asig.magnitude[:100])
+
+        t_start, t_stop = isig.times[100], isig.times[199]
+        window = self.io.read_irregularlysampledsignal(
+            segpath + "/irregularlysampledsignals/isig",
+            t_start=t_start, t_stop=t_stop
+        )
+        np.testing.assert_almost_equal(window.magnitude,
+                                       isig.magnitude[100:200])
+        np.testing.assert_almost_equal(window.times.magnitude,
+                                       isig.times.magnitude[100:200])
+
+    def test_signal_chunks_read(self):
+        blk = Block(name="chunks")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((1000, 3), pq.mV),
+                            sampling_rate=pq.kHz, t_start=2*pq.s,
+                            name="asig")
+        seg.analogsignals.append(asig)
+        self.io.write_block(blk)
+
+        sigpath = "/chunks/segments/seg/analogsignals/asig"
+        overlap = 10
+        chunks = list(self.io.iter_signal_chunks(sigpath, 300, overlap))
+        self.assertGreater(len(chunks), 1)
+        self.assertLessEqual(len(chunks[0]), 300)
+        position = 0
+        for idx, chunk in enumerate(chunks):
+            start = position - overlap if idx else 0
+            np.testing.assert_almost_equal(
+                chunk.magnitude, asig.magnitude[start:start + len(chunk)]
+            )
+            self.assertAlmostEqual(chunk.t_start, asig.times[start])
+            position = start + len(chunk)
+        self.assertEqual(position, len(asig))
+
+        chunks = list(self.io.iter_signal_chunks(sigpath, 400, channels=[1]))
+        data = np.concatenate(list(c.magnitude for c in chunks))
+        np.testing.assert_almost_equal(data, asig.magnitude[:, 1:2])
+
+        # requests of at least one HDF5 chunk are aligned to HDF5 chunks
+        nix_da = self.io._get_signal_data_arrays(sigpath)[0][0]
+        h5chunk = h5dataset(nix_da).chunks[0]
+        if h5chunk < len(asig):
+            chunks = list(self.io.iter_signal_chunks(sigpath, h5chunk + 1))
+            self.assertEqual(len(chunks[0]), h5chunk)
+
+    def test_channel_subset_read(self):
+        blk = Block(name="subsets")
+        seg = Segment(name="seg")
+        blk.segments.append(seg)
+        asig = AnalogSignal(signal=self.rquant((100, 4), pq.mV),
+                            sampling_rate=pq.kHz, name="asig")
+        isig = IrregularlySampledSignal(times=self.rquant(50, pq.s, True),
+                                        signal=self.rquant((50, 2), pq.mV),
+                                        name="isig")
+        seg.analogsignals.append(asig)
+        seg.irregularlysampledsignals.append(isig)
+        chx = ChannelIndex(name="tetrode", index=[0, 1, 2, 3],
+                           channel_names=["c0", "c1", "c2", "c3"])
+        chx.analogsignals.append(asig)
+        blk.channel_indexes.append(chx)
+        self.io.write_block(blk)
+
+        sigpath = "/subsets/segments/seg/analogsignals/asig"
+        subset = self.io.read_analogsignal(sigpath, channels=[3, 1])
+        np.testing.assert_almost_equal(subset.magnitude,
+                                       asig.magnitude[:, [3, 1]])
+        subset = self.io.read_analogsignal(sigpath, channels=["c2"])
+        np.testing.assert_almost_equal(subset.magnitude,
+                                       asig.magnitude[:, [2]])
+        pair = ChannelIndex(index=[0, 2])
+        subset = self.io.read_analogsignal(sigpath, channels=pair)
+        np.testing.assert_almost_equal(subset.magnitude,
+                                       asig.magnitude[:, [0, 2]])
+        with self.assertRaises(ValueError):
+            self.io.read_analogsignal(sigpath, channels=["nochannel"])
+        with self.assertRaises(ValueError):
+            self.io.read_analogsignal(sigpath, channels=[-1])
+        window = self.io.read_analogsignal(sigpath, t_start=10*pq.ms)
+        for partial in (subset, window):
+            self.assertFalse(any(obj is partial
+                                 for obj in self.io._object_map.values()))
+        self.assertNotIn(sigpath, self.io._unhashed_paths)
+
+        neo_block = self.io.read_block("/subsets", channels=["c1", "c3"])
+        neo_seg = neo_block.segments[0]
+        self.assertEqual(len(neo_seg.analogsignals), 1)
+        self.assertEqual(len(neo_seg.irregularlysampledsignals), 1)
+        np.testing.assert_almost_equal(neo_seg.analogsignals[0].magnitude,
+                                       asig.magnitude[:, [1, 3]])
+        np.testing.assert_almost_equal(
+            neo_seg.irregularlysampledsignals[0].magnitude,
+            isig.magnitude[:, [1]]
+        )
+        previous = neo_block
+        neo_block = self.io.read_block("/subsets", channels=[3])
+        neo_seg = neo_block.segments[0]
+        self.assertEqual(len(neo_seg.analogsignals), 1)
+        self.assertEqual(len(neo_seg.irregularlysampledsignals), 0)
+        # ChannelIndexes link only the signals read for their own Block
+        neo_chx = neo_block.channel_indexes[0]
+        self.assertEqual(len(neo_chx.analogsignals), 1)
+        self.assertIs(neo_chx.analogsignals[0], neo_seg.analogsignals[0])
+        self.assertIs(previous.channel_indexes[0].analogsignals[0],
+                      previous.segments[0].analogsignals[0])
+
     def test_basic_attr_write(self):
         """
         Write full data tree: Basic attributes test
@@ -1346,6 +2156,37 @@ class NixIOReadTest(NixIOTest):
         neo_blocks = self.io.read_all_blocks(cascade=True, lazy=False)
         self.compare_blocks(neo_blocks, self.nix_blocks)
 
+    def test_parallel_read(self):
+        neo_blocks = self.io.read_all_blocks(cascade=True, lazy=False,
+                                             workers=2)
+        self.compare_blocks(neo_blocks, self.nix_blocks)
+        for block in neo_blocks:
+            for seg in block.segments:
+                self.assertIs(seg.block, block)
+                for st in seg.spiketrains:
+                    self.assertIs(st.segment, seg)
+            for chx in block.channel_indexes:
+                for sig in chx.analogsignals:
+                    self.assertIs(sig.channel_index, chx)
+                    self.assertIn(sig, sig.segment.analogsignals)
+                for unit in chx.units:
+                    for st in unit.spiketrains:
+                        self.assertIs(st.unit, unit)
+                        self.assertIn(st, st.segment.spiketrains)
+            self.assertIs(self.io._get_mapped_object(
+                self.io.nix_file.blocks[block.name]
+            ), block)
+
+    def test_parallel_read_writable(self):
+        self.io.nix_file.close()
+        self.io = NixIO(self.filename, "rw")
+        with mock.patch("neonix.io.nixio.get_context") as get_context:
+            neo_blocks = self.io.read_all_blocks(cascade=True, lazy=False,
+                                                 workers=2)
+        get_context.assert_not_called()
+        self.compare_blocks(neo_blocks, self.nix_blocks)
+        self.io.nix_file.close()
+
     def test_lazyload_fullcascade_read(self):
         """
         Read everything lazily: Lazy integration test with all features
@@ -1432,6 +2273,205 @@ class NixIOReadTest(NixIOTest):
         segment = self.io.load_lazy_cascade(segpath, lazy=False)
         self.assertEqual(np.shape(segment.analogsignals[0]), (100, 3))
 
+    def test_lazy_proxies(self):
+        nix_block = self.io.nix_file.blocks[0]
+        nix_group = nix_block.groups[0]
+        segpath = "/" + nix_block.name + "/segments/" + nix_group.name
+        segment = self.io.read_segment(segpath, lazy=True)
+        signal_groups = self.io._get_signal_groups(nix_group)
+        for sig in (segment.analogsignals +
+                    segment.irregularlysampledsignals):
+            self.assertEqual(len(sig), 0)
+            proxy = sig.proxy
+            self.assertEqual(proxy.shape, sig.lazy_shape)
+            das = signal_groups[sig.name]
+            data = np.transpose(list(np.array(da) for da in das))
+            np.testing.assert_almost_equal(proxy[10:20, 1].magnitude,
+                                           data[10:20, 1])
+            np.testing.assert_almost_equal(proxy[5].magnitude, data[5])
+            np.testing.assert_almost_equal(proxy[::7, [2, 0]].magnitude,
+                                           data[::7, [2, 0]])
+            self.assertEqual(proxy.units, pq.mV)
+            if isinstance(sig, AnalogSignal):
+                timedim = das[0].dimensions[0]
+                self.assertEqual(sig.t_start,
+                                 pq.Quantity(timedim.offset, timedim.unit))
+                self.assertEqual(
+                    sig.sampling_period,
+                    pq.Quantity(timedim.sampling_interval, timedim.unit)
+                )
+            np.testing.assert_almost_equal(
+                proxy.times.magnitude,
+                self.io.read_signal(sig.path).times.magnitude
+            )
+        for st in segment.spiketrains:
+            self.assertEqual(len(st), 0)
+            mtag = nix_group.multi_tags[st.name]
+            np.testing.assert_almost_equal(st.proxy[2:4].magnitude,
+                                           mtag.positions[2:4])
+            wfproxy = st.waveforms_proxy
+            self.assertEqual(wfproxy.shape, mtag.features[0].data.shape)
+            self.assertEqual(st.left_sweep,
+                             pq.Quantity(20, st.sampling_period.units))
+        for ep in segment.epochs:
+            mtag = nix_group.multi_tags[ep.name]
+            np.testing.assert_almost_equal(ep.durations_proxy[:].magnitude,
+                                           mtag.extents)
+
+    def test_lazy_registry(self):
+        nix_block = self.io.nix_file.blocks[0]
+        nix_group = nix_block.groups[0]
+        segpath = "/" + nix_block.name + "/segments/" + nix_group.name
+        segment = self.io.read_segment(segpath, lazy=True)
+        lazy_objects = self.io.lazy_loaded_objects()
+        children = (segment.analogsignals + segment.irregularlysampledsignals +
+                    segment.spiketrains + segment.events + segment.epochs)
+        self.assertEqual(len(lazy_objects), len(children) + 1)
+        for child in children:
+            self.assertIs(self.io._find_lazy_loaded(child), child)
+            self.assertIs(self.io._find_lazy_loaded(child.path), child)
+        # loading an object in full removes it from the registry
+        sig = segment.analogsignals[0]
+        self.io.load_lazy_object(sig)
+        self.assertIsNone(self.io._find_lazy_loaded(sig))
+        st = segment.spiketrains[0]
+        self.io.release_lazy(st)
+        self.assertIsNone(self.io._find_lazy_loaded(st))
+        self.assertNotIn(st, self.io._object_map.values())
+        self.assertNotIn(id(st), self.io._object_keys)
+
+        class NoScanDict(dict):
+            def items(self):
+                raise AssertionError("object map scanned")
+            keys = values = __iter__ = items
+
+        # objects are removed through the reverse index, without scanning
+        self.io._object_map = NoScanDict(self.io._object_map)
+        self.io.release_lazy()
+        self.assertEqual(self.io.lazy_loaded_objects(), [])
+        self.io._object_map = dict(dict.items(self.io._object_map))
+        for child in children:
+            self.assertNotIn(child, self.io._object_map.values())
+
+    def test_path_cache(self):
+        blk = self.io.nix_file.blocks[0]
+        segpath = "/" + blk.name + "/segments/" + blk.groups[0].name
+        nix_group = self.io._get_object_at(segpath)
+        self.assertEqual(nix_group, blk.groups[0])
+        self.io._get_parent = mock.Mock()
+        self.assertEqual(self.io._get_object_at(segpath), nix_group)
+        self.io._get_parent.assert_not_called()
+
+    def test_source_referers(self):
+        nix_block = self.io.nix_file.blocks[0]
+        for nix_source in nix_block.sources:
+            for container in ("data_arrays", "multi_tags"):
+                expected = list(
+                    ref for ref in getattr(nix_block, container)
+                    if nix_source.id in list(src.id for src in ref.sources)
+                )
+                referers = self.io._get_referers(nix_source, nix_block,
+                                                 container)
+                self.assertEqual(referers, expected)
+        self.assertIn(nix_block.id, self.io._source_referers)
+
+    def test_no_hash_on_read(self):
+        self.io._hash_object = mock.Mock()
+        neo_blocks = self.io.read_all_blocks()
+        self.io._hash_object.assert_not_called()
+        self.assertEqual(self.io._object_hashes, dict())
+        for block in neo_blocks:
+            self.assertIn(block.path, self.io._unhashed_paths)
+            for seg in block.segments:
+                self.assertIn(seg.path, self.io._unhashed_paths)
+        del self.io._hash_object
+        block = neo_blocks[0]
+        self.assertEqual(self.io._hash_stored_object(block.path),
+                         self.io._hash_object(block))
+
+    def test_hash_stored_object_state(self):
+        self.io._change_detection = "snapshot"
+        nix_block = self.io.nix_file.blocks[0]
+        blkpath = "/" + nix_block.name
+        neo_block = self.io.read_block(blkpath, lazy=True)
+        segment = neo_block.segments[0]
+        self.io.read_segment(neo_block.segments[1].path)
+        lazy_loaded = dict(self.io._lazy_loaded)
+        unhashed = set(self.io._unhashed_paths)
+        states = dict(self.io._object_states)
+        object_map = dict(self.io._object_map)
+        paths = [blkpath, segment.path]
+        paths.extend(obj.path for obj in segment.analogsignals +
+                     segment.spiketrains + segment.epochs)
+        for path in paths:
+            self.io._hash_stored_object(path)
+        # hashing stored objects leaves the state of the IO unchanged
+        self.assertEqual(dict(self.io._lazy_loaded), lazy_loaded)
+        self.assertEqual(self.io._unhashed_paths, unhashed)
+        self.assertEqual(set(self.io._object_states), set(states))
+        for path, state in states.items():
+            self.assertIs(self.io._object_states[path], state)
+        self.assertEqual(self.io._object_map, object_map)
+        for path in paths:
+            self.assertIs(self.io._find_lazy_loaded(path),
+                          lazy_loaded[path])
+
+    def test_iter_segments(self):
+        nix_block = self.io.nix_file.blocks[0]
+        self.io._prefetch_metadata(nix_block.metadata)
+        self.io._get_source_referers(nix_block)
+        previous = None
+        count = 0
+        for neo_segment in self.io.iter_segments("/" + nix_block.name):
+            nix_group = nix_block.groups[neo_segment.name]
+            self.compare_segment_group(neo_segment, nix_group)
+            self.assertIs(self.io._get_mapped_object(nix_group), neo_segment)
+            self.assertIn(nix_group.metadata.id, self.io._metadata_cache)
+            if previous is not None:
+                self.assertNotIn(previous, self.io._object_map.values())
+                for st in previous.spiketrains:
+                    self.assertNotIn(st, self.io._object_map.values())
+                prev_group = nix_block.groups[previous.name]
+                self.assertNotIn(prev_group.id, self.io._signal_groups)
+                self.assertNotIn(prev_group.metadata.id,
+                                 self.io._metadata_cache)
+                self.assertNotIn(nix_block.id, self.io._source_referers)
+                # metadata of other objects stays cached
+                self.assertIn(nix_block.metadata.id, self.io._metadata_cache)
+            previous = neo_segment
+            count += 1
+        self.assertEqual(count, len(nix_block.groups))
+        self.assertNotIn(previous, self.io._object_map.values())
+        prefix = "/" + nix_block.name + "/segments/"
+        for cache in (self.io._object_hashes, self.io._unhashed_paths,
+                      self.io._object_states):
+            for key in cache:
+                self.assertFalse(key.startswith(prefix))
+
+    def test_metadata_prefetch(self):
+        nix_block = self.io.nix_file.blocks[0]
+        self.io.read_block("/" + nix_block.name)
+        sections = [nix_block.metadata]
+        while sections:
+            sec = sections.pop()
+            self.assertIn(sec.id, self.io._metadata_cache)
+            sections.extend(sec.sections)
+        self.io._read_metadata_props = mock.Mock()
+        for nix_group in nix_block.groups:
+            neo_attrs = self.io._nix_attr_to_neo(nix_group)
+            for prop in nix_group.metadata.props:
+                self.assertIn(prop.name, neo_attrs)
+        self.io._read_metadata_props.assert_not_called()
+
+    def test_read_signal_data(self):
+        nix_group = self.io.nix_file.blocks[0].groups[0]
+        for das in self.io._get_signal_groups(nix_group).values():
+            data = self.io._read_signal_data(das)
+            self.assertEqual(data.shape, (len(das[0]), len(das)))
+            self.assertTrue(data.flags["C_CONTIGUOUS"])
+            for idx, da in enumerate(das):
+                np.testing.assert_almost_equal(data[:, idx], np.array(da))
+
 
 class NixIOHashTest(NixIOTest):
 
@@ -1530,6 +2570,20 @@ class NixIOHashTest(NixIOTest):
                     self.rword(): lambda: self.rquant((10, 10), pq.mV)}
         self._hash_test(SpikeTrain, argfuncs)
 
+    @mock.patch("neonix.io.nixio.HASH_CHUNK_SIZE", 1024)
+    def test_chunked_hash(self):
+        data = self.rquant((1000, 10), pq.mV)
+        asig = AnalogSignal(data, sampling_rate=pq.kHz)
+        asig_f = AnalogSignal(np.asfortranarray(data), sampling_rate=pq.kHz)
+        self.assertFalse(asig_f.flags["C_CONTIGUOUS"])
+        hash_one = self.hash(asig, workers=1)
+        self.assertEqual(hash_one, self.hash(asig, workers=4))
+        self.assertEqual(hash_one, self.hash(asig_f, workers=4))
+        self.assertEqual(hash_one, self.hash(asig_f, workers=1))
+        self.assertNotEqual(hash_one, self.hash(asig, hash_factory=md5))
+        asig[500, 3] += 1*pq.mV
+        self.assertNotEqual(hash_one, self.hash(asig, workers=4))
+
 
 class NixIOPartialWriteTest(NixIOTest):
 
@@ -1614,11 +2668,15 @@ class NixIOPartialWriteTest(NixIOTest):
         self.compare_blocks(self.neo_blocks, self.io.nix_file.blocks)
 
         # change hashes to force write
+        self.assertTrue(self.io._object_hashes)
         for k, v in self.io._object_hashes.items():
             self.io._object_hashes[k] = "a"
         self.io.write_all_blocks(self.neo_blocks)
         hash_post = nixfile_hash()
         # self.assertNotEqual(hash_pre, hash_post)
+        written = set(call[0][2] for call in
+                      self.io._write_attr_annotations.call_args_list)
+        self.assertEqual(written, set(self.io._object_hashes))
 
         self.compare_blocks(self.neo_blocks, self.io.nix_file.blocks)
 